@@ -1,4 +1,5 @@
 import time
+import math
 import json
 import os
 import random
@@ -11,13 +12,79 @@ matplotlib.use('Agg')  # Use the Agg backend which doesn't require a GUI
 # Vérifier si nous sommes dans le thread principal
 is_main_thread = threading.current_thread() is threading.main_thread()
 import matplotlib.pyplot as plt
-from game.move import Move
+from game.move import Move, SQUARE_NAMES, move_from, to_positions, to_uci, to_algebraic, CAPTURE, EN_PASSANT, PROMOTION
+from game.bitboard import (
+    WHITE, BLACK, COLOR_INDEX, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, PIECE_NAMES, FILE_A, popcount, iter_squares,
+)
+from game.rules.move_generator import generate_moves, generate_captures, generate_evasions, in_check
+from game.move_picker import PIECE_VALUES, mvv_lva, pick_moves
+from game.see import see
+from game.transposition import TranspositionTable, EXACT, LOWERBOUND, UPPERBOUND
+from game.lazy_smp import SharedTranspositionTable, start_helpers, collect_helpers
 import pickle
-from concurrent.futures import ThreadPoolExecutor
+from array import array
 from functools import lru_cache
 
+# Score d'un mat, diminué du nombre de demi-coups depuis la racine dans la recherche
+MATE_SCORE = 20000
+MATE_BOUND = MATE_SCORE - 1000
+
+# Profondeur maximale (en demi-coups) des tables de coups killers
+MAX_PLY = 64
+# Coup nul : profondeur minimale, réduction de base, et nombre de pièces (hors pions)
+# en dessous duquel un échec de la recherche nulle est vérifié (risque de zugzwang)
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_VERIFY_PIECES = 2
+# Au-delà, les scores d'historique sont divisés par deux pour garder de la place aux coups récents
+HISTORY_MAX = 1 << 20
+
+# Marges par profondeur (index 1, 2, ...) de l'élagage de futilité inversé et du razoring
+REVERSE_FUTILITY_MARGINS = (0, 150, 300, 450)
+RAZOR_MARGINS = (0, 300, 550)
+
+# Quiescence : marge de l'élagage delta et nombre maximal de nœuds en échec dont on examine les parades
+DELTA_MARGIN = 200
+QS_MAX_EVASIONS = 2
+# Nombre d'évaluations gardées en mémoire (par clé de Zobrist) avant de vider le cache
+EVAL_CACHE_SIZE = 1 << 16
+# Pénalité de evaluate_board pour une pièce de l'IA attaquée et non défendue (fraction de sa valeur)
+HANGING_PIECE_PENALTY = 0.3
+# Écart maximal entre l'évaluation complète et le seul bilan matériel et positionnel, hors pénalités
+# d'échange : contrôle du centre (4 × 50 + 12 × 0,5 × 25), sécurité du roi (8 × 10), échec (50) et
+# mobilité (0,1 × 218 coups au plus). Les pions doublés et passés ne sont pas bornés : c'est
+# l'approximation de l'évaluation paresseuse en quiescence
+LAZY_EVAL_MARGIN = 4 * 50 + 12 * 25 // 2 + 8 * 10 + 50 + 22
+
+# Réductions des coups tardifs (LMR), indexées par [profondeur][rang du coup dans la liste]
+LMR_MIN_DEPTH = 3
+LMR_MIN_INDEX = 3
+LMR_REDUCTIONS = [
+    [0 if depth == 0 or index == 0 else int(0.75 + math.log(depth) * math.log(index) / 2.25) for index in range(64)]
+    for depth in range(64)
+]
+
+
+def score_to_tt(score, ply):
+    """Les scores de mat sont stockés relativement au nœud, pas à la racine."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    """Inverse de score_to_tt pour un nœud situé à `ply` demi-coups de la racine."""
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
 class AI:
-    def __init__(self, color="black", difficulty="easy"):
+    def __init__(self, color="black", difficulty="easy", tt_size_mb=16):
         self.color = color
         self.difficulty = difficulty  # "easy", "medium", "hard"
         self.piece_values = {
@@ -105,12 +172,15 @@ class AI:
         
         # Pré-calculer les tables inversées pour les pions noirs
         self.position_tables["Pawn_black"] = np.flipud(self.position_tables["Pawn"])
+        self._build_material_tables()
         
-        # Initialiser la table de transposition
-        self.transposition_table = {}
+        # Initialiser la table de transposition (taille fixe, en mégaoctets)
+        self.tt_size_mb = tt_size_mb
+        self.transposition_table = TranspositionTable(self.tt_size_mb)
         
         # Initialiser la base de données d'ouvertures avec pandas
         self.opening_book = self.load_opening_book()
+        self.board_state_cache = {}  # FEN simplifiée par clé de Zobrist
         
         # Initialiser la base de données d'apprentissage
         self.learning_data = self.load_learning_data()
@@ -118,8 +188,20 @@ class AI:
         # Historique des parties pour l'apprentissage
         self.game_history = []
         
+        # Évaluations déjà calculées, du point de vue de self.color
+        self.eval_cache = {}
+        
+        # Marges d'élagage aux nœuds frontière, ajustables par profondeur
+        self.reverse_futility_margins = list(REVERSE_FUTILITY_MARGINS)
+        self.razor_margins = list(RAZOR_MARGINS)
+        
+        # Mémoire des coupures pour ordonner les coups tranquilles (killers, historique, réponses)
+        self.clear_move_ordering()
+        
         # Nombre de nœuds évalués (pour les statistiques)
         self.nodes_evaluated = 0
+        # Vrai quand la recherche en cours a dépassé son temps : ses scores ne sont plus fiables
+        self.search_aborted = False
         self.evaluation_times = []
         self.move_times = []
         
@@ -127,12 +209,51 @@ class AI:
         self.thought_log = []
         self.max_log_entries = 100  # Limiter le nombre d'entrées pour éviter une utilisation excessive de la mémoire
         
-        # Nombre de threads pour le parallélisme
-        self.max_workers = 4
+        # Nombre de processus de recherche (Lazy SMP en difficulté difficile)
+        self.max_workers = os.cpu_count() or 1
         
+    def __getstate__(self):
+        # Les tables de recherche ne sont pas sauvegardées avec la partie : elles sont recréées vides
+        state = self.__dict__.copy()
+        for name in ("transposition_table", "eval_cache", "board_state_cache", "killers", "history",
+                     "countermoves", "material_tables"):
+            state.pop(name, None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tt_size_mb = state.get("tt_size_mb", 16)
+        self.transposition_table = TranspositionTable(self.tt_size_mb)
+        self.clear_move_ordering()
+        self.eval_cache = {}
+        self.board_state_cache = {}
+        self._build_material_tables()
+        # Parties sauvegardées avant l'ajout des marges d'élagage
+        self.__dict__.setdefault("reverse_futility_margins", list(REVERSE_FUTILITY_MARGINS))
+        self.__dict__.setdefault("razor_margins", list(RAZOR_MARGINS))
+        self.search_aborted = False
+    
+    def _build_material_tables(self):
+        """Valeur matérielle et positionnelle de chaque pièce sur chaque case, comme dans evaluate_board."""
+        self.material_tables = []
+        for color in ("white", "black"):
+            tables = []
+            for piece_type in range(6):
+                name = PIECE_NAMES[piece_type]
+                table = self.position_tables["Pawn_black" if name == "Pawn" and color == "black" else name]
+                tables.append([self.piece_values[name] + float(table[sq >> 3, sq & 7]) * 0.1 for sq in range(64)])
+            self.material_tables.append(tables)
+    
+    def clear_move_ordering(self):
+        """Vide les coups killers par demi-coup, l'historique (couleur, départ, arrivée) et les réponses aux coups."""
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = (array("i", bytes(4 * 4096)), array("i", bytes(4 * 4096)))
+        self.countermoves = array("H", bytes(2 * 4096))
+    
     def set_color(self, color):
         """Définit la couleur de l'IA."""
         self.color = color
+        self.eval_cache = {}  # Les évaluations sont du point de vue de l'ancienne couleur
         
     def set_difficulty(self, difficulty):
         """Définit la difficulté de l'IA."""
@@ -167,7 +288,7 @@ class AI:
             return None
             
         # Sélectionner un coup par défaut au cas où le temps serait dépassé
-        default_move = random.choice(all_valid_moves)
+        default_move = to_positions(random.choice(all_valid_moves))
         
         # Vérifier si nous sommes dans l'ouverture (avec un timeout)
         try:
@@ -179,9 +300,8 @@ class AI:
             if opening_move:
                 self.log_thought("Coup d'ouverture trouvé dans la base de données")
                 start_pos, end_pos = opening_move
-                start_notation = chr(start_pos[1] + ord('a')) + str(8 - start_pos[0])
-                end_notation = chr(end_pos[1] + ord('a')) + str(8 - end_pos[0])
-                self.log_thought(f"Joue le coup d'ouverture: {start_notation} → {end_notation}")
+                self.log_thought(f"Joue le coup d'ouverture: {SQUARE_NAMES[start_pos[0] * 8 + start_pos[1]]} → "
+                                 f"{SQUARE_NAMES[end_pos[0] * 8 + end_pos[1]]}")
                 return opening_move
         except Exception as e:
             pass  # Add a placeholder statement to handle the exception
@@ -229,29 +349,23 @@ class AI:
         if not all_moves:
             return None
             
-        # Évaluer chaque mouvement
+        # Évaluer chaque mouvement sur une seule copie jouée puis annulée
         move_scores = []
-        for start_pos, end_pos in all_moves:
-            # Simuler le mouvement
-            temp_board = board.copy()
-            start_row, start_col = start_pos
-            end_row, end_col = end_pos
-            
-            # Exécuter le mouvement sur le plateau temporaire
-            piece = temp_board.get_piece(start_row, start_col)
-            temp_board.set_piece(end_row, end_col, piece)
-            temp_board.set_piece(start_row, start_col, "")
+        temp_board = board.copy()
+        for move in all_moves:
+            temp_board.make_move(move)
             
             # Évaluer la position résultante
             score = self.evaluate_board(temp_board)
-            move_scores.append((score, (start_pos, end_pos)))
+            temp_board.unmake_move()
+            move_scores.append((score, move))
         
         # Trier les mouvements par score
         move_scores.sort(reverse=True)
         
         # Sélectionner un mouvement parmi les 40% meilleurs
         top_moves = move_scores[:max(1, len(move_scores) // 3)]
-        return random.choice([move for _, move in top_moves])
+        return to_positions(random.choice([move for _, move in top_moves]))
     
     def get_opening_move(self, board):
         """Cherche un mouvement dans la base de données d'ouvertures de manière optimisée."""
@@ -308,16 +422,17 @@ class AI:
     @lru_cache(maxsize=256)  # Utiliser un cache pour éviter de recalculer les mêmes conversions
     def parse_move_notation(self, move_notation):
         """Convertit une notation de mouvement (ex: 'e2e4') en positions de départ et d'arrivée."""
-        start_col = ord(move_notation[0]) - ord('a')
-        start_row = 8 - int(move_notation[1])
-        end_col = ord(move_notation[2]) - ord('a')
-        end_row = 8 - int(move_notation[3])
-        
-        return ((start_row, start_col), (end_row, end_col))
+        from_sq = SQUARE_NAMES.index(move_notation[:2])
+        to_sq = SQUARE_NAMES.index(move_notation[2:4])
+        return ((from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7))
     
-    @lru_cache(maxsize=1024)  # Utiliser un cache pour éviter de recalculer les états de plateau déjà vus
     def get_board_state(self, board):
         """Convertit le plateau en une représentation FEN simplifiée."""
+        # Cache indexé par la clé de Zobrist : le plateau est modifié sur place,
+        # son identité ne suffit donc pas à reconnaître une position déjà vue
+        fen = self.board_state_cache.get(board.zobrist_key)
+        if fen is not None:
+            return fen
         try:
             # Utiliser des listes et join pour une meilleure performance
             rows = []
@@ -334,7 +449,7 @@ class AI:
                             empty = 0
                         # Vérifier si piece est un objet ou une chaîne
                         if hasattr(piece, '__class__') and hasattr(piece, 'color'):
-                            piece_type = piece.__class__.__name__[0]
+                            piece_type = PIECE_NAMES[piece.piece_type][0]
                             if piece.color == "white":
                                 row_str.append(piece_type.upper())
                             else:
@@ -350,6 +465,9 @@ class AI:
             turn = "w" if hasattr(board, 'turn') and board.turn == "white" else "b"
             fen = '/'.join(rows) + " " + turn
             
+            if len(self.board_state_cache) >= 1024:
+                self.board_state_cache.clear()
+            self.board_state_cache[board.zobrist_key] = fen
             return fen
         except Exception as e:
             # En cas d'erreur, retourner une chaîne qui ne sera pas dans la base de données
@@ -366,9 +484,16 @@ class AI:
             max_time: Le temps maximum de réflexion en secondes (par défaut: 10 secondes)
         """
         start_time = time.time()
+        self.search_aborted = False
+        
+        # Les coups de la recherche sont joués sur une copie : le plateau de la partie reste
+        # lisible (et sauvegardable) par les autres threads du serveur pendant la réflexion
+        search_board = board.clone_position()
         
-        # Réinitialiser la table de transposition pour cette recherche
-        self.transposition_table = {}
+        # La table de transposition est conservée d'un coup à l'autre : les entrées
+        # des recherches précédentes sont seulement marquées comme remplaçables en priorité
+        self.transposition_table.new_search()
+        self.clear_move_ordering()
         
         all_moves = self.get_all_valid_moves(board, self.color)
         if not all_moves:
@@ -377,6 +502,13 @@ class AI:
         # Trier les mouvements pour améliorer l'élagage alpha-beta
         sorted_moves = self.order_moves(board, all_moves)
         
+        # Le coup prévu par la recherche précédente pour cette position est examiné en premier
+        entry = self.transposition_table.probe(self.hash_board(board))
+        if entry is not None and entry[3] in sorted_moves:
+            sorted_moves.remove(entry[3])
+            sorted_moves.insert(0, entry[3])
+            self.log_thought(f"Coup de la table de transposition: {to_algebraic(entry[3])} (profondeur {entry[0]})")
+        
         # Sélectionner un coup par défaut au cas où le temps serait dépassé
         default_move = sorted_moves[0] if sorted_moves else None
         
@@ -384,15 +516,12 @@ class AI:
         self.log_thought("Évaluation rapide des premiers coups...")
         quick_results = []
         for i, move in enumerate(sorted_moves[:min(5, len(sorted_moves))]):
-            start_pos, end_pos = move
-            temp_board = board.copy()
-            piece = temp_board.get_piece(start_pos[0], start_pos[1])
-            temp_board.set_piece(end_pos[0], end_pos[1], piece)
-            temp_board.set_piece(start_pos[0], start_pos[1], "")
+            is_safe = self.is_move_safe(search_board, move)
+            search_board.make_move(move)
             
             # Évaluation simple
-            score = self.evaluate_board(temp_board)
-            is_safe = self.is_move_safe(board, temp_board, start_pos, end_pos, piece)
+            score = self.evaluate_board(search_board)
+            search_board.unmake_move()
             quick_results.append((score, move, is_safe))
             
             # Si nous avons au moins un coup évalué et que le temps commence à être long, on s'arrête
@@ -415,113 +544,92 @@ class AI:
         # Approfondissement itératif: commencer par une profondeur faible et augmenter progressivement
         best_move_so_far = best_quick_move
         best_score_so_far = best_quick_score
+        completed_depth = 0
+        
+        # Temps de recherche commun au processus principal et aux auxiliaires
+        search_time = max_time * 0.8
+        
+        # Lazy SMP : des processus auxiliaires cherchent la même position en partageant la table de transposition
+        helpers = []
+        if self.use_lazy_smp():
+            self._share_transposition_table()
+            helpers = start_helpers(self, board, depth, start_time, search_time)
+            self.log_thought(f"Lazy SMP: {len(helpers)} processus auxiliaires")
         
         # Commencer à une profondeur de 2 et augmenter jusqu'à la profondeur maximale
         for current_depth in range(2, depth + 1):
             # Vérifier si nous avons encore assez de temps
             elapsed_time = time.time() - start_time
-            if elapsed_time > max_time * 0.8:
-                self.log_thought(f"Temps presque écoulé ({elapsed_time:.2f}s), arrêt à la profondeur {current_depth-1}")
+            if self.search_aborted or elapsed_time > search_time:
+                self.log_thought(f"Temps presque écoulé ({elapsed_time:.2f}s), arrêt à la profondeur {completed_depth}")
                 break
                 
             self.log_thought(f"Analyse à la profondeur {current_depth}...")
             
-            # Réinitialiser les résultats pour cette profondeur
-            depth_results = []
-        
-            # Utiliser le parallélisme pour évaluer les mouvements en parallèle à cette profondeur
-            try:
-                if len(sorted_moves) > 1 and current_depth >= 3:
-                    self.log_thought(f"Évaluation parallèle de {len(sorted_moves)} coups à la profondeur {current_depth}")
-                    
-                    # Calculer le temps restant pour cette profondeur
-                    remaining_time = max_time * 0.8 - (time.time() - start_time)
-                    time_per_depth = remaining_time / (depth - current_depth + 1)
-                    depth_timeout = min(time_per_depth, max_time * 0.3)  # Ne pas utiliser plus de 30% du temps total
-                    
-                    # Utiliser ThreadPoolExecutor avec un timeout
-                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                        future_to_move = {executor.submit(self._evaluate_single_move, board, move, current_depth, start_time, depth_timeout): move for move in sorted_moves}
-                        
-                        # Collecter les résultats au fur et à mesure qu'ils sont disponibles
-                        for future in ThreadPoolExecutor().map(lambda f: f, future_to_move.keys(), timeout=depth_timeout):
-                            try:
-                                result = future.result(timeout=0.1)  # Petit timeout pour vérifier si le résultat est prêt
-                                depth_results.append(result)
-                                
-                                # Si le temps est presque écoulé, on s'arrête
-                                if time.time() - start_time > max_time * 0.8:
-                                    self.log_thought(f"Temps presque écoulé, arrêt de l'évaluation à la profondeur {current_depth}")
-                                    break
-                            except Exception as e:
-                                # Si une exception se produit, on continue avec les autres coups
-                                continue
-                else:
-                    self.log_thought(f"Évaluation séquentielle de {len(sorted_moves)} coups à la profondeur {current_depth}")
-                    
-                    # Évaluer les coups séquentiellement avec vérification du temps
-                    for i, move in enumerate(sorted_moves):
-                        # Vérifier si le temps est presque écoulé
-                        if time.time() - start_time > max_time * 0.8:
-                            self.log_thought(f"Temps presque écoulé, arrêt de l'évaluation à la profondeur {current_depth}")
-                            break
-                        
-                        result = self._evaluate_single_move(board, move, current_depth, start_time, max_time * 0.2)
-                        depth_results.append(result)
-                
-                # Mettre à jour le meilleur coup pour cette profondeur
-                if depth_results:
-                    best_depth_score = -float('inf')
-                    best_depth_move = best_move_so_far
-                    
-                    for score, move, is_safe in depth_results:
-                        if score > best_depth_score:
-                            best_depth_score = score
-                            best_depth_move = move
-                    
-                    # Mettre à jour le meilleur coup global
-                    best_move_so_far = best_depth_move
-                    best_score_so_far = best_depth_score
-                    self.log_thought(f"Meilleur coup à la profondeur {current_depth}: {best_depth_move} (score: {best_depth_score:.1f})")
-                
-            except Exception as e:
-                # En cas d'erreur, continuer avec la profondeur suivante
-                self.log_thought(f"Erreur à la profondeur {current_depth}: {str(e)}")
-                continue
-        
-        # Utiliser le meilleur coup trouvé ou le coup rapide si aucun résultat
-        if best_move_so_far:
-            self.log_thought(f"Meilleur coup final: {best_move_so_far} (score: {best_score_so_far:.1f})")
-            results = depth_results if depth_results else quick_results
-        else:
-            self.log_thought("Aucun résultat obtenu, utilisation des résultats rapides")
-            results = quick_results
-        
-        # Trouver le meilleur coup et les coups sûrs parmi tous les résultats
-        best_score = best_score_so_far
-        best_move = best_move_so_far  # Utiliser le meilleur coup trouvé par l'approfondissement itératif
-        # Ne pas réinitialiser safe_moves car nous l'avons déjà initialisé plus haut
-        
-        # Parcourir tous les résultats pour trouver les coups sûrs
-        for score, move, is_safe in results:
-            if is_safe:
-                safe_moves.append((score, move))
+            # Recherche PVS : seul le meilleur coup reçoit un score exact, les autres sont seulement réfutés
+            score, move = self.search_root(search_board, current_depth, start_time, search_time, sorted_moves)
             
-            # Mettre à jour le meilleur coup si nécessaire
-            if score > best_score:
-                best_score = score
-                best_move = move
-                
-        # Si nous avons des coups sûrs, choisir le meilleur parmi eux
-        if safe_moves:
-            safe_moves.sort(reverse=True)  # Trier par score décroissant
-            best_safe_score, best_safe_move = safe_moves[0]
+            # Une profondeur ne compte que si tous les coups de la racine ont été examinés à temps
+            if self.search_aborted:
+                self.log_thought(f"Temps écoulé, profondeur {current_depth} abandonnée")
+                break
+            if not move:
+                break
             
-            # Si le meilleur coup sûr n'est pas trop inférieur au meilleur coup global, le préférer
-            if best_safe_score > best_score - 150:  # Tolérance réduite à 150 points pour favoriser les coups sûrs
-                self.log_thought(f"Choix d'un coup plus sûr: {best_safe_score:.1f} vs {best_score:.1f}")
-                best_move = best_safe_move
-                best_score = best_safe_score
+            best_move_so_far, best_score_so_far = move, score
+            completed_depth = current_depth
+            # Le meilleur coup est examiné en premier à la profondeur suivante
+            sorted_moves.remove(move)
+            sorted_moves.insert(0, move)
+            self.log_thought(f"Meilleur coup à la profondeur {current_depth}: {to_uci(move)} (score: {score:.1f})")
+        
+        # Combiner avec les auxiliaires : le résultat le plus profond l'emporte
+        best_pv = []
+        for helper_depth, helper_score, helper_move, pv, nodes in collect_helpers(
+                helpers, start_time + max_time * 0.85, start_time):
+            self.nodes_evaluated += nodes
+            if helper_depth > completed_depth and helper_move in sorted_moves:
+                completed_depth = helper_depth
+                best_move_so_far, best_score_so_far = helper_move, helper_score
+                best_pv = pv
+                self.log_thought(f"Auxiliaire plus profond ({helper_depth}): {to_uci(helper_move)} (score: {helper_score:.1f})")
+        
+        best_move = best_move_so_far
+        best_score = best_score_so_far
+        self.log_thought(f"Meilleur coup final: {to_uci(best_move)} (score: {best_score:.1f})")
+        
+        if not completed_depth:
+            # Aucune profondeur terminée : on se contente des évaluations rapides
+            self.log_thought("Aucun résultat obtenu, utilisation des résultats rapides")
+            if safe_moves:
+                safe_moves.sort(reverse=True)
+                best_safe_score, best_safe_move = safe_moves[0]
+                if best_safe_score > best_score - 150:
+                    best_move, best_score = best_safe_move, best_safe_score
+        elif not self.is_move_safe(board, best_move):
+            # Le meilleur coup perd du matériel à l'échange : un coup sûr est préféré s'il ne coûte
+            # pas plus de 150 points. Les coups sûrs sont cherchés avec cette borne comme alpha,
+            # si bien que seul un coup qui la dépasse reçoit un score exact
+            floor = best_score - 150
+            safe = [move for move in sorted_moves if move != best_move and see(board, move) >= 0]
+            if safe and time.time() - start_time < max_time * 0.85:
+                score, move = self.search_root(search_board, completed_depth, start_time, max_time * 0.9, safe, floor)
+                if not self.search_aborted and move and score > floor:
+                    self.log_thought(f"Choix d'un coup plus sûr: {score:.1f} vs {best_score:.1f}")
+                    best_move, best_score = move, score
+        
+        # Variante principale du coup réellement joué : celle de l'auxiliaire retenu, sinon lue
+        # dans la table après ce coup (l'entrée de la racine peut avoir été réécrite par un auxiliaire)
+        if completed_depth and best_move:
+            if best_pv[:1] != [best_move]:
+                search_board.make_move(best_move)
+                best_pv = [best_move] + self.get_principal_variation(search_board, completed_depth - 1)
+                search_board.unmake_move()
+            self.log_thought(f"Variante principale: {' '.join(to_uci(move) for move in best_pv)}")
+        
+        # Le reste du jeu manipule des coups ((row, col), (row, col))
+        if best_move is not None:
+            best_move = to_positions(best_move)
         
         # Enregistrer le mouvement dans l'historique pour l'apprentissage
         if best_move:
@@ -535,7 +643,8 @@ class AI:
         # Afficher des statistiques détaillées
         self.log_thought(f"Temps total de réflexion: {total_time:.2f} secondes")
         self.log_thought(f"Nombre de nœuds évalués: {self.nodes_evaluated}")
-        self.log_thought(f"Profondeur maximale atteinte: {depth}")
+        self.log_thought(f"Remplissage de la table de transposition: {self.transposition_table.hashfull()}‰")
+        self.log_thought(f"Profondeur maximale atteinte: {completed_depth}")
         self.log_thought(f"Score du meilleur coup: {best_score:.1f}")
         
         self.log_thought(f"Temps total de réflexion: {total_time:.2f} secondes")
@@ -546,85 +655,6 @@ class AI:
         
         return best_move
     
-    def _evaluate_single_move(self, board, move, depth, start_time=None, max_time=None):
-        """Évalue un seul mouvement avec une limite de temps optionnelle."""
-        start_pos, end_pos = move
-        temp_board = board.copy()
-        start_row, start_col = start_pos
-        end_row, end_col = end_pos
-        
-        # Exécuter le mouvement sur le plateau temporaire
-        piece = temp_board.get_piece(start_row, start_col)
-        temp_board.set_piece(end_row, end_col, piece)
-        temp_board.set_piece(start_row, start_col, "")
-        
-        # Vérifier si ce coup met une pièce en danger sans compensation
-        is_safe = self.is_move_safe(board, temp_board, start_pos, end_pos, piece)
-        
-        # Évaluer le score avec minimax
-        alpha = -float('inf')
-        beta = float('inf')
-        
-        # Passer les paramètres de temps à minimax
-        score = -self.minimax(temp_board, depth-1, -beta, -alpha, False, start_time, max_time)
-        
-        return (score, move, is_safe)
-    
-    def _evaluate_moves_parallel(self, board, moves, depth, start_time=None, max_time=None):
-        """Évalue les mouvements en parallèle pour améliorer les performances."""
-        results = []
-        
-        # Utiliser ThreadPoolExecutor pour le parallélisme
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(self._evaluate_single_move, board, move, depth, start_time, max_time) for move in moves]
-            for future in futures:
-                try:
-                    # Vérifier si le temps est presque écoulé
-                    if start_time and max_time and time.time() - start_time > max_time * 0.9:
-                        break
-                    
-                    # Utiliser un petit timeout pour éviter de bloquer
-                    result = future.result(timeout=0.5)
-                    results.append(result)
-                except Exception as e:
-                    # En cas d'erreur, continuer avec les autres coups
-                    continue
-        
-        return results
-    
-    def _evaluate_moves_sequential(self, board, moves, depth, start_time=None, max_time=None):
-        """Évalue les mouvements séquentiellement avec une limite de temps optionnelle."""
-        results = []
-        alpha = -float('inf')
-        beta = float('inf')
-        
-        for move in moves:
-            # Vérifier si le temps est presque écoulé
-            if start_time and max_time and time.time() - start_time > max_time * 0.9:
-                self.log_thought(f"Temps presque écoulé, arrêt de l'évaluation séquentielle après {len(results)} coups")
-                break
-                
-            start_pos, end_pos = move
-            temp_board = board.copy()
-            start_row, start_col = start_pos
-            end_row, end_col = end_pos
-            
-            # Exécuter le mouvement sur le plateau temporaire
-            piece = temp_board.get_piece(start_row, start_col)
-            temp_board.set_piece(end_row, end_col, piece)
-            temp_board.set_piece(start_row, start_col, "")
-            
-            # Vérifier si ce coup met une pièce en danger sans compensation
-            is_safe = self.is_move_safe(board, temp_board, start_pos, end_pos, piece)
-            
-            # Évaluer le score avec minimax
-            score = -self.minimax(temp_board, depth-1, -beta, -alpha, False, start_time, max_time)
-            
-            results.append((score, move, is_safe))
-            alpha = max(alpha, score)
-        
-        return results
-        
     def _generate_performance_chart(self):
         """Génère un graphique de performance pour analyser l'IA."""
         try:
@@ -686,59 +716,22 @@ class AI:
             self.log_thought(f"Erreur lors de la génération du graphique: {e}")
                 # Ne pas afficher l'erreur dans la console pour éviter de polluer les logs
         
-    def is_move_safe(self, original_board, new_board, start_pos, end_pos, moved_piece):
-        """Vérifie si un coup est sûr (ne donne pas de pièces gratuitement)."""
-        # Obtenir la valeur de la pièce déplacée
-        piece_type = moved_piece.__class__.__name__
-        piece_value = self.piece_values.get(piece_type, 0)
-        
-        # Obtenir les pièces attaquées après le coup
-        attacked_pieces = self.get_attacked_pieces(new_board)
-        
-        # Vérifier si la pièce déplacée est attaquée et non défendue
-        end_row, end_col = end_pos
-        if (end_row, end_col) in attacked_pieces:
-            # Vérifier si la pièce est défendue
-            defended_pieces = self.get_defended_pieces(new_board)
-            is_defended = (end_row, end_col) in defended_pieces
-            
-            if not is_defended:
-                # La pièce est attaquée et non défendue
-                self.log_thought(f"Coup dangereux: {piece_type} en {chr(end_col + ord('a'))}{8-end_row} serait attaqué et non défendu")
-                return False
-            
-            # Même si elle est défendue, vérifier si l'échange est favorable
-            attackers = attacked_pieces[(end_row, end_col)]
-            lowest_attacker_value = float('inf')
-            
-            for attacker_row, attacker_col in attackers:
-                attacker = new_board.get_piece(attacker_row, attacker_col)
-                if attacker and hasattr(attacker, '__class__'):
-                    attacker_type = attacker.__class__.__name__
-                    attacker_value = self.piece_values.get(attacker_type, 0)
-                    lowest_attacker_value = min(lowest_attacker_value, attacker_value)
-            
-            # Si l'attaquant le moins cher vaut moins que notre pièce, l'échange est défavorable
-            if lowest_attacker_value < piece_value:
-                self.log_thought(f"Échange défavorable: {piece_type} ({piece_value}) contre {lowest_attacker_value}")
-                return False
-        
+    def is_move_safe(self, board, move):
+        """Vérifie si un coup est sûr (ne donne pas de pièces gratuitement), par SEE avant de le jouer."""
+        gain = see(board, move)
+        if gain < 0:
+            self.log_thought(f"Coup dangereux: {to_algebraic(move)} perd {-gain} à l'échange")
+            return False
         return True
     
     def order_moves(self, board, moves):
         """Trie les mouvements pour améliorer l'élagage alpha-beta."""
         move_scores = []
         
-        # Calculer les pièces attaquées et défendues
-        attacked_pieces = self.get_attacked_pieces(board)
+        them = BLACK if self.color == "white" else WHITE
         
         # Déterminer si nous sommes en début de partie
-        piece_count = 0
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, 'color'):
-                    piece_count += 1
+        piece_count = popcount(board.occupied)
         
         early_game = piece_count >= 28  # Considérer comme début de partie si plus de 28 pièces
         
@@ -749,39 +742,21 @@ class AI:
                           (4, 2), (4, 5), 
                           (5, 2), (5, 3), (5, 4), (5, 5)]
         
-        for start_pos, end_pos in moves:
+        for move in moves:
             score = 0
+            start_pos, end_pos = to_positions(move)
             start_row, start_col = start_pos
             end_row, end_col = end_pos
             
             # Priorité aux captures
             target_piece = board.get_piece(end_row, end_col)
-            if target_piece and hasattr(target_piece, 'color') and target_piece.color != self.color:
-                piece_type = target_piece.__class__.__name__
-                target_value = self.piece_values.get(piece_type, 0)
+            if target_piece and target_piece.color != self.color:
+                target_value = self.piece_values[PIECE_NAMES[target_piece.piece_type]]
                 
-                # Évaluer l'échange
-                piece = board.get_piece(start_row, start_col)
-                if piece and hasattr(piece, '__class__'):
-                    piece_type = piece.__class__.__name__
-                    piece_value = self.piece_values.get(piece_type, 0)
-                    
-                    # Vérifier si la pièce qui capture sera elle-même capturée
-                    temp_board = board.copy()
-                    temp_board.set_piece(end_row, end_col, piece)
-                    temp_board.set_piece(start_row, start_col, "")
-                    
-                    # Vérifier si la case d'arrivée est attaquée
-                    future_attacked = self.get_attacked_pieces(temp_board)
-                    if (end_row, end_col) in future_attacked:
-                        # Échange défavorable
-                        if piece_value > target_value:
-                            score += target_value - piece_value  # Pénalité pour l'échange défavorable
-                        else:
-                            score += 10 * target_value  # Bonus pour l'échange favorable
-                    else:
-                        # Capture sans risque
-                        score += 10 * target_value
+                # Évaluer l'échange : une prise perdante est pénalisée de sa perte
+                gain = see(board, move)
+                if gain < 0:
+                    score += gain
                 else:
                     score += 10 * target_value
             
@@ -796,34 +771,24 @@ class AI:
                 
                 # Bonus pour le développement des pièces en début de partie
                 piece = board.get_piece(start_row, start_col)
-                if piece and hasattr(piece, '__class__'):
-                    piece_type = piece.__class__.__name__
+                if piece:
                     # Encourager le développement des cavaliers et fous
-                    if piece_type in ["Knight", "Bishop"]:
+                    if piece.piece_type in (KNIGHT, BISHOP):
                         # Si la pièce est sur sa position initiale
                         if (piece.color == "white" and start_row == 7) or (piece.color == "black" and start_row == 0):
                             score += 80  # Bonus pour sortir les pièces
             
             # Priorité aux promotions de pions
             piece = board.get_piece(start_row, start_col)
-            if piece and hasattr(piece, '__class__') and piece.__class__.__name__ == 'Pawn':
+            if piece and piece.piece_type == PAWN:
                 if (piece.color == 'white' and end_row == 0) or (piece.color == 'black' and end_row == 7):
                     score += 900  # Valeur d'une dame
             
-            # Éviter de déplacer des pièces déjà attaquées vers des cases non défendues
-            if (start_row, start_col) in attacked_pieces:
-                # Simuler le mouvement
-                temp_board = board.copy()
-                temp_board.set_piece(end_row, end_col, piece)
-                temp_board.set_piece(start_row, start_col, "")
-                
-                # Vérifier si la case d'arrivée est attaquée
-                future_attacked = self.get_attacked_pieces(temp_board)
-                future_defended = self.get_defended_pieces(temp_board)
-                
-                if (end_row, end_col) in future_attacked and (end_row, end_col) not in future_defended:
-                    # La pièce serait en danger
-                    score -= 500
+            # Éviter de déplacer des pièces déjà attaquées vers des cases où elles seraient perdues
+            start_sq = start_row * 8 + start_col
+            if board.attackers_to(start_sq, them) and see(board, move) < 0:
+                # La pièce serait en danger
+                score -= 500
             
             # Priorité aux mouvements vers le centre
             center_distance = abs(3.5 - end_row) + abs(3.5 - end_col)
@@ -834,7 +799,7 @@ class AI:
             if move_key in self.learning_data:
                 score += self.learning_data[move_key] * 5
             
-            move_scores.append((score, (start_pos, end_pos)))
+            move_scores.append((score, move))
         
         # Trier les mouvements par score décroissant
         move_scores.sort(reverse=True)
@@ -860,39 +825,110 @@ class AI:
         if len(self.thought_log) > self.max_log_entries:
             self.thought_log.pop(0)
     
-    def minimax(self, board, depth, alpha, beta, is_maximizing, start_time=None, max_time=None):
-        """Implémentation de l'algorithme minimax avec élagage alpha-beta et table de transposition."""
-        # Vérifier si le temps est écoulé
+    def use_lazy_smp(self):
+        """La recherche sur plusieurs processus est réservée à la difficulté difficile."""
+        return self.difficulty == "hard" and self.max_workers > 1
+    
+    def _share_transposition_table(self):
+        """Remplace la table de transposition par une table en mémoire partagée, en gardant son contenu."""
+        table = self.transposition_table
+        if isinstance(table, SharedTranspositionTable):
+            return
+        shared = SharedTranspositionTable(self.tt_size_mb)
+        shared.entries[:] = table.entries
+        shared.generation = table.generation
+        self.transposition_table = shared
+    
+    def search_root(self, board, depth, start_time=None, max_time=None, moves=None, alpha=-float('inf')):
+        """
+        Recherche PVS de la racine ; retourne (score, meilleur coup 16 bits) du point de vue du camp au trait.
+        `moves` restreint et ordonne les coups examinés. Avec un `alpha` initial, seul un score
+        qui le dépasse est exact. Si le temps est écoulé avant la fin, search_aborted est vrai
+        et le résultat ne doit pas être utilisé.
+        """
+        self.search_aborted = False
+        beta = float('inf')
+        board_hash = self.hash_board(board)
+        legal = board.status().moves
+        # Seule une recherche de tous les coups à fenêtre complète donne le résultat de la racine
+        complete = alpha == -float('inf') and (moves is None or len(moves) == len(legal))
+        if moves is None:
+            entry = self.transposition_table.probe(board_hash)
+            moves = pick_moves(board, legal, entry[3] if entry is not None else 0)
+        
+        best_score, best_move = -float('inf'), 0
+        for index, move in enumerate(moves):
+            board.make_move(move)
+            if index == 0:
+                score = -self.negamax(board, depth-1, -beta, -alpha, 1, start_time, max_time)
+            else:
+                score = -self.negamax(board, depth-1, -alpha-1, -alpha, 1, start_time, max_time)
+                if score > alpha:
+                    score = -self.negamax(board, depth-1, -beta, -alpha, 1, start_time, max_time)
+            board.unmake_move()
+            if self.search_aborted:
+                return best_score, best_move
+            
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+        
+        if best_move and complete:
+            self.transposition_table.store(board_hash, depth, score_to_tt(best_score, 0), EXACT, best_move)
+        return best_score, best_move
+    
+    def get_principal_variation(self, board, max_length=10):
+        """Retourne la suite de meilleurs coups lue dans la table de transposition."""
+        pv = []
+        while len(pv) < max_length:
+            entry = self.transposition_table.probe(self.hash_board(board))
+            if entry is None or not entry[3] or entry[3] not in board.status().moves:
+                break
+            board.make_move(entry[3])
+            pv.append(entry[3])
+        for _ in pv:
+            board.unmake_move()
+        return pv
+    
+    def negamax(self, board, depth, alpha, beta, ply=0, start_time=None, max_time=None, allow_null=True):
+        """
+        Recherche négamax avec élagage alpha-beta, table de transposition, recherche
+        à fenêtre nulle (PVS), élagages aux nœuds frontière (futilité inversée, razoring),
+        élagage par coup nul et réduction des coups tardifs (LMR).
+        Le score est donné du point de vue du camp au trait. allow_null est faux juste
+        après un coup nul.
+        """
+        # Temps écoulé : la recherche est abandonnée, les nœuds remontent sans rien enregistrer
+        if self.search_aborted:
+            return 0
         if start_time and max_time and time.time() - start_time > max_time * 0.95:
-            # Si le temps est presque écoulé, retourner une évaluation rapide
-            return self.evaluate_board(board) if is_maximizing else -self.evaluate_board(board)
+            self.search_aborted = True
+            return 0
             
         # Incrémenter le compteur de nœuds
         self.nodes_evaluated += 1
         
         # Enregistrer la pensée seulement pour les niveaux les plus élevés (pour réduire drastiquement les logs)
         if depth >= 5:  # Augmenter le seuil pour réduire le nombre de logs
-            player = self.color if is_maximizing else ("white" if self.color == "black" else "black")
-            # Simplifier le message pour réduire la taille des logs
-            self.log_thought(f"Analyse profondeur {depth}, {player}")
+            self.log_thought(f"Analyse profondeur {depth}, {board.turn}")
         
         # Vérifier la table de transposition
+        original_alpha = alpha
         board_hash = self.hash_board(board)
-        if board_hash in self.transposition_table:
-            stored_depth, stored_score, stored_flag = self.transposition_table[board_hash]
+        tt_move = 0
+        entry = self.transposition_table.probe(board_hash)
+        if entry is not None:
+            stored_depth, stored_score, stored_flag, tt_move = entry
+            stored_score = score_from_tt(stored_score, ply)
             if stored_depth >= depth:
-                if stored_flag == 'exact':
+                if stored_flag == EXACT:
                     if depth >= 5:  # Augmenter le seuil pour réduire les logs
                         self.log_thought(f"Position trouvée dans table, score: {stored_score:.1f}")
                     return stored_score
-                elif stored_flag == 'lowerbound' and stored_score > alpha:
+                elif stored_flag == LOWERBOUND and stored_score > alpha:
                     alpha = stored_score
-                    if depth >= 5:  # Augmenter le seuil
-                        self.log_thought(f"Borne inf: {alpha:.1f}")
-                elif stored_flag == 'upperbound' and stored_score < beta:
+                elif stored_flag == UPPERBOUND and stored_score < beta:
                     beta = stored_score
-                    if depth >= 5:  # Augmenter le seuil
-                        self.log_thought(f"Borne sup: {beta:.1f}")
                 
                 if alpha >= beta:
                     if depth >= 5:  # Augmenter le seuil
@@ -900,247 +936,292 @@ class AI:
                     return stored_score
         
         # Vérifier les conditions de terminaison
-        if depth == 0:
-            score = self.quiescence_search(board, alpha, beta, is_maximizing, 3, start_time, max_time)
-            if depth >= 5:  # Augmenter le seuil
-                self.log_thought(f"Quiescence: {score:.1f}")
-            return score
-        
-        # Vérifier si le jeu est terminé
-        game_status = board.check_game_status()
-        if game_status != "In Progress":
-            if game_status == "Checkmate":
-                score = -20000 if is_maximizing else 20000
-                if depth >= 5:  # Augmenter le seuil
-                    self.log_thought(f"Échec et mat: {score}")
-                return score
-            else:  # Stalemate
-                if depth >= 5:  # Augmenter le seuil
-                    self.log_thought("Pat: 0")
-                return 0
-        
-        # Récupérer les mouvements valides
-        color = self.color if is_maximizing else ("white" if self.color == "black" else "black")
-        all_moves = self.get_all_valid_moves(board, color)
-        
-        # Trier les mouvements pour améliorer l'élagage
-        sorted_moves = self.order_moves(board, all_moves)
-        
-        if depth >= 5:  # Augmenter le seuil
-            self.log_thought(f"Coups: {len(sorted_moves)}")
-        
-        if is_maximizing:
-            max_score = -float('inf')
-            best_move = None
-            
-            for start_pos, end_pos in sorted_moves:
-                # Suppression du log d'évaluation de chaque coup pour améliorer les performances
-                
-                # Simuler le mouvement
-                temp_board = board.copy()
-                start_row, start_col = start_pos
-                end_row, end_col = end_pos
-                
-                # Exécuter le mouvement sur le plateau temporaire
-                piece = temp_board.get_piece(start_row, start_col)
-                temp_board.set_piece(end_row, end_col, piece)
-                temp_board.set_piece(start_row, start_col, "")
-                
-                score = self.minimax(temp_board, depth-1, alpha, beta, False, start_time, max_time)
-                
-                if score > max_score:
-                    max_score = score
-                    best_move = (start_pos, end_pos)
-                    if depth >= 3:
-                        start_notation = chr(start_pos[1] + ord('a')) + str(8 - start_pos[0])
-                        end_notation = chr(end_pos[1] + ord('a')) + str(8 - end_pos[0])
-                        self.log_thought(f"Nouveau meilleur coup: {start_notation} → {end_notation} avec score {score:.1f}")
-                
-                alpha = max(alpha, max_score)
-                
-                if beta <= alpha:
-                    if depth >= 3:
-                        self.log_thought(f"Coupure alpha-beta (α={alpha:.1f}, β={beta:.1f})")
-                    break
-                    
-            # Stocker le résultat dans la table de transposition
-            if max_score <= alpha:
-                flag = 'upperbound'
-            elif max_score >= beta:
-                flag = 'lowerbound'
+        if depth <= 0:
+            return self.quiescence_search(board, alpha, beta, ply, QS_MAX_EVASIONS, start_time, max_time)
+        
+        # Nulle par matériel insuffisant ou règle des 50 coups (sauf mat, rare : le statut complet tranche).
+        # Le mat et le pat sont reconnus après la boucle, quand aucun coup n'a été trouvé
+        if board.halfmove_clock >= 100 or board.is_insufficient_material():
+            return -MATE_SCORE + ply if board.status().checkmate else 0
+        
+        us = COLOR_INDEX[board.turn]
+        check = in_check(board)
+        # Les élagages ci-dessous ne s'appliquent qu'aux fenêtres nulles, hors échec et hors scores de mat
+        prunable = beta - alpha <= 1 and not check and abs(beta) < MATE_BOUND
+        static_eval = self._evaluate_relative(board) if prunable else None
+        
+        # Élagage de futilité inversé : l'évaluation dépasse beta d'une marge que l'adversaire
+        # ne peut pas rattraper en si peu de demi-coups
+        if prunable and depth < len(self.reverse_futility_margins):
+            if static_eval - self.reverse_futility_margins[depth] >= beta:
+                return static_eval
+        
+        # Razoring : l'évaluation est si loin sous alpha que seules des prises peuvent sauver la position
+        if prunable and depth < len(self.razor_margins):
+            if static_eval + self.razor_margins[depth] < alpha:
+                score = self.quiescence_search(board, alpha, beta, ply, QS_MAX_EVASIONS, start_time, max_time)
+                if depth == 1 or score < alpha:
+                    return score
+        
+        # Coup nul : si passer son tour suffit encore à dépasser beta, un vrai coup le fera aussi.
+        # Jamais sans pièce autre que des pions (zugzwang)
+        if prunable and allow_null and depth >= NULL_MOVE_MIN_DEPTH and static_eval >= beta:
+            pieces = board.bitboards[us]
+            non_pawn = popcount(pieces[KNIGHT] | pieces[BISHOP] | pieces[ROOK] | pieces[QUEEN])
+            if non_pawn:
+                reduction = NULL_MOVE_REDUCTION + depth // 4
+                board.make_null_move()
+                score = -self.negamax(board, depth-1-reduction, -beta, -beta+1, ply+1, start_time, max_time, False)
+                board.unmake_null_move()
+                if self.search_aborted:
+                    return 0
+                if score >= beta:
+                    # Finales avec peu de pièces : on vérifie par une recherche réduite sans coup nul
+                    if non_pawn > NULL_MOVE_VERIFY_PIECES or self.negamax(
+                            board, depth-1-reduction, beta-1, beta, ply, start_time, max_time, False) >= beta:
+                        return beta
+        
+        # Les coups sont générés par étapes (coup de la table, prises, killers, coups tranquilles) :
+        # une coupure sur les premiers coups évite de générer et de trier les suivants
+        previous = self._previous_move(board)
+        sorted_moves = pick_moves(board, None, tt_move, self.killers[ply] if ply < MAX_PLY else (),
+                                  self.history[us], self.countermoves[previous] if previous is not None else 0)
+        quiets_tried = []
+        
+        best_score = -float('inf')
+        best_move = None
+        killers = self.killers[ply] if ply < MAX_PLY else ()
+        for index, move in enumerate(sorted_moves):
+            # Jouer le coup sur place puis l'annuler
+            board.make_move(move)
+            if index == 0:
+                # Variante principale supposée : fenêtre complète
+                score = -self.negamax(board, depth-1, -beta, -alpha, ply+1, start_time, max_time)
             else:
-                flag = 'exact'
-            self.transposition_table[board_hash] = (depth, max_score, flag)
-            
-            if depth >= 3 and best_move:
-                start_pos, end_pos = best_move
-                start_notation = chr(start_pos[1] + ord('a')) + str(8 - start_pos[0])
-                end_notation = chr(end_pos[1] + ord('a')) + str(8 - end_pos[0])
-                self.log_thought(f"Meilleur coup à la profondeur {depth}: {start_notation} → {end_notation} (score: {max_score:.1f})")
-            
-            return max_score
-        else:
-            min_score = float('inf')
-            best_move = None
-            
-            for start_pos, end_pos in sorted_moves:
-                # Convertir en notation d'échecs pour le log
-                if depth >= 3:
-                    start_notation = chr(start_pos[1] + ord('a')) + str(8 - start_pos[0])
-                    end_notation = chr(end_pos[1] + ord('a')) + str(8 - end_pos[0])
-                    self.log_thought(f"Évaluation du coup {start_notation} → {end_notation}")
-                
-                # Simuler le mouvement
-                temp_board = board.copy()
-                start_row, start_col = start_pos
-                end_row, end_col = end_pos
-                
-                # Exécuter le mouvement sur le plateau temporaire
-                piece = temp_board.get_piece(start_row, start_col)
-                temp_board.set_piece(end_row, end_col, piece)
-                temp_board.set_piece(start_row, start_col, "")
-                
-                score = self.minimax(temp_board, depth-1, alpha, beta, True, start_time, max_time)
+                # Coups tardifs tranquilles (hors échecs et killers) : recherche réduite d'abord
+                reduction = 0
+                if (depth >= LMR_MIN_DEPTH and index >= LMR_MIN_INDEX and not check
+                        and not move >> 12 & (CAPTURE | PROMOTION) and move not in killers
+                        and not in_check(board)):
+                    reduction = LMR_REDUCTIONS[min(depth, 63)][min(index, 63)]
+                    if beta - alpha > 1:
+                        reduction -= 1  # Moins de réduction dans la variante principale
+                    reduction = max(0, min(reduction, depth - 2))
                 
-                if score < min_score:
-                    min_score = score
-                    best_move = (start_pos, end_pos)
-                    if depth >= 3:
-                        start_notation = chr(start_pos[1] + ord('a')) + str(8 - start_pos[0])
-                        end_notation = chr(end_pos[1] + ord('a')) + str(8 - end_pos[0])
-                        self.log_thought(f"Nouveau meilleur coup: {start_notation} → {end_notation} avec score {score:.1f}")
-                
-                beta = min(beta, min_score)
-                
-                if beta <= alpha:
-                    if depth >= 3:
-                        self.log_thought(f"Coupure alpha-beta (α={alpha:.1f}, β={beta:.1f})")
-                    break
-            
-            # Stocker le résultat dans la table de transposition
-            if min_score <= alpha:
-                flag = 'upperbound'
-            elif min_score >= beta:
-                flag = 'lowerbound'
-            else:
-                flag = 'exact'
-            self.transposition_table[board_hash] = (depth, min_score, flag)
+                # Les autres coups sont seulement réfutés avec une fenêtre nulle,
+                # et recherchés à nouveau s'ils s'avèrent meilleurs
+                score = -self.negamax(board, depth-1-reduction, -alpha-1, -alpha, ply+1, start_time, max_time)
+                if reduction and score > alpha:
+                    score = -self.negamax(board, depth-1, -alpha-1, -alpha, ply+1, start_time, max_time)
+                if alpha < score < beta:
+                    score = -self.negamax(board, depth-1, -beta, -alpha, ply+1, start_time, max_time)
+            board.unmake_move()
+            if self.search_aborted:
+                return 0
             
-            if depth >= 3 and best_move:
-                start_pos, end_pos = best_move
-                start_notation = chr(start_pos[1] + ord('a')) + str(8 - start_pos[0])
-                end_notation = chr(end_pos[1] + ord('a')) + str(8 - end_pos[0])
-                self.log_thought(f"Meilleur coup à la profondeur {depth}: {start_notation} → {end_notation} (score: {min_score:.1f})")
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if depth >= 3:
+                    self.log_thought(f"Nouveau meilleur coup: {to_algebraic(move)} avec score {score:.1f}")
             
-            return min_score
+            alpha = max(alpha, score)
+            quiet = not move >> 12 & (CAPTURE | PROMOTION)
+            if alpha >= beta:
+                if quiet:
+                    self._update_move_ordering(us, move, quiets_tried, depth, ply, previous)
+                if depth >= 3:
+                    self.log_thought(f"Coupure alpha-beta (α={alpha:.1f}, β={beta:.1f})")
+                break
+            if quiet:
+                quiets_tried.append(move)
+        
+        if best_move is None:
+            # Aucun coup légal : mat (plus proche de la racine, il vaut plus) ou pat
+            return -MATE_SCORE + ply if check else 0
+        
+        # Stocker le résultat dans la table de transposition
+        if best_score <= original_alpha:
+            flag = UPPERBOUND
+        elif best_score >= beta:
+            flag = LOWERBOUND
+        else:
+            flag = EXACT
+        self.transposition_table.store(board_hash, depth, score_to_tt(best_score, ply), flag, best_move or 0)
+        
+        if depth >= 3 and best_move is not None:
+            self.log_thought(f"Meilleur coup à la profondeur {depth}: {to_algebraic(best_move)} (score: {best_score:.1f})")
+        
+        return best_score
     
-    def quiescence_search(self, board, alpha, beta, is_maximizing, depth=3, start_time=None, max_time=None):
-        """Recherche de quiescence pour éviter l'effet d'horizon."""
-        # Vérifier si le temps est écoulé
+    def _previous_move(self, board):
+        """Index (départ, arrivée) sur 12 bits du dernier coup joué, ou None."""
+        if not board.undo_stack:
+            return None
+        record = board.undo_stack[-1]
+        if record.start is None:
+            return None  # Coup nul
+        return (record.start[0] * 8 + record.start[1]) | ((record.end[0] * 8 + record.end[1]) << 6)
+    
+    def _update_move_ordering(self, us, move, quiets_tried, depth, ply, previous):
+        """Coupure beta sur un coup tranquille : il devient killer, réponse au coup précédent, et gagne en historique."""
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        if previous is not None:
+            self.countermoves[previous] = move
+        
+        history = self.history[us]
+        bonus = depth * depth
+        history[move & 4095] += bonus
+        # Les coups tranquilles essayés avant sans succès perdent d'autant
+        for tried in quiets_tried:
+            history[tried & 4095] = max(-HISTORY_MAX, history[tried & 4095] - bonus)
+        if history[move & 4095] > HISTORY_MAX:
+            for index in range(4096):
+                history[index] //= 2
+    
+    def quiescence_search(self, board, alpha, beta, ply=0, evasions=QS_MAX_EVASIONS, start_time=None, max_time=None):
+        """
+        Recherche de quiescence (négamax) pour éviter l'effet d'horizon. Elle s'arrête
+        d'elle-même quand il n'y a plus de prise utile ; `evasions` limite le nombre de
+        nœuds en échec où toutes les parades sont examinées.
+        """
+        # Temps écoulé : la recherche est abandonnée
+        if self.search_aborted:
+            return 0
         if start_time and max_time and time.time() - start_time > max_time * 0.95:
-            # Si le temps est presque écoulé, retourner une évaluation rapide
-            return self.evaluate_board(board)
+            self.search_aborted = True
+            return 0
             
-        # Évaluation de base
-        stand_pat = self.evaluate_board(board)
-        
-        # Vérifier les conditions de terminaison
-        if depth == 0:
+        # En échec, on ne peut pas se contenter de l'évaluation statique : toutes les parades sont examinées
+        if evasions > 0 and ply < MAX_PLY and in_check(board):
+            return self._quiescence_evasions(board, alpha, beta, ply, evasions, start_time, max_time)
+
+        # Évaluation de base : le camp au trait peut toujours s'abstenir de prendre.
+        # Le bilan matériel suffit quand il est loin de la fenêtre ; sinon on calcule l'évaluation complète
+        stand_pat = self._evaluate_material(board)
+        below, above = self._lazy_eval_margins(board)
+        if alpha - above < stand_pat < beta + below or board.halfmove_clock >= 100:
+            stand_pat = self._evaluate_relative(board)
+        if stand_pat >= beta or ply >= MAX_PLY:
             return stand_pat
+        if alpha < stand_pat:
+            alpha = stand_pat
+            
+        # Récupérer uniquement les prises et promotions, la plus grosse victime d'abord
+        grid = board.board
+        captures = sorted(self.get_capture_moves(board, board.turn), key=lambda move: mvv_lva(board, move), reverse=True)
+        
+        for move in captures:
+            # Élagage delta : même en gagnant la pièce prise (et la promotion), on reste sous alpha
+            to_sq = (move >> 6) & 63
+            target = grid[to_sq >> 3][to_sq & 7]
+            if target != "":
+                gain = PIECE_VALUES[target.piece_type]
+            else:
+                gain = PIECE_VALUES[PAWN] if move >> 12 == EN_PASSANT else 0
+            if move >> 12 & PROMOTION:
+                gain += PIECE_VALUES[QUEEN] - PIECE_VALUES[PAWN]
+            if stand_pat + gain + DELTA_MARGIN <= alpha:
+                continue
+            # Les prises qui perdent du matériel à l'échange ne sont pas examinées
+            if see(board, move) < 0:
+                continue
+            # Jouer la capture sur place puis l'annuler
+            board.make_move(move)
+            score = -self.quiescence_search(board, -beta, -alpha, ply+1, evasions, start_time, max_time)
+            board.unmake_move()
             
-        if is_maximizing:
-            if stand_pat >= beta:
-                return beta
-            if alpha < stand_pat:
-                alpha = stand_pat
-                
-            # Récupérer uniquement les captures
-            captures = self.get_capture_moves(board, self.color)
-            
-            for start_pos, end_pos in captures:
-                # Simuler le mouvement
-                temp_board = board.copy()
-                start_row, start_col = start_pos
-                end_row, end_col = end_pos
-                
-                # Exécuter le mouvement sur le plateau temporaire
-                piece = temp_board.get_piece(start_row, start_col)
-                temp_board.set_piece(end_row, end_col, piece)
-                temp_board.set_piece(start_row, start_col, "")
-                
-                score = self.quiescence_search(temp_board, alpha, beta, False, depth-1, start_time, max_time)
-                
-                if score >= beta:
-                    return beta
-                if score > alpha:
-                    alpha = score
-            
-            return alpha
-        else:
-            if stand_pat <= alpha:
-                return alpha
-            if beta > stand_pat:
-                beta = stand_pat
-                
-            # Récupérer uniquement les captures
-            opponent_color = "white" if self.color == "black" else "black"
-            captures = self.get_capture_moves(board, opponent_color)
-            
-            for start_pos, end_pos in captures:
-                # Simuler le mouvement
-                temp_board = board.copy()
-                start_row, start_col = start_pos
-                end_row, end_col = end_pos
-                
-                # Exécuter le mouvement sur le plateau temporaire
-                piece = temp_board.get_piece(start_row, start_col)
-                temp_board.set_piece(end_row, end_col, piece)
-                temp_board.set_piece(start_row, start_col, "")
-                
-                score = self.quiescence_search(temp_board, alpha, beta, True, depth-1, start_time, max_time)
-                
-                if score <= alpha:
-                    return alpha
-                if score < beta:
-                    beta = score
-            
-            return beta
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        
+        return alpha
     
+    def _quiescence_evasions(self, board, alpha, beta, ply, evasions, start_time, max_time):
+        """Nœud de quiescence en échec : on examine les parades, sans évaluation statique."""
+        moves = generate_evasions(board)
+        if not moves:
+            # Échec et mat
+            return -MATE_SCORE + ply
+
+        best_score = -MATE_SCORE + ply
+        for move in pick_moves(board, moves):
+            board.make_move(move)
+            score = -self.quiescence_search(board, -beta, -alpha, ply+1, evasions-1, start_time, max_time)
+            board.unmake_move()
+
+            if score >= beta:
+                return score
+            best_score = max(best_score, score)
+            alpha = max(alpha, score)
+
+        return best_score
+
+    def _evaluate_relative(self, board):
+        """Évaluation du point de vue du camp au trait, comme l'attend la recherche négamax."""
+        # La nullité par la règle des 50 coups dépend d'un compteur absent de la clé
+        if board.halfmove_clock >= 100:
+            score = self.evaluate_board(board)
+            return score if board.turn == self.color else -score
+        # Une même position est souvent évaluée plusieurs fois (élagages, puis quiescence)
+        score = self.eval_cache.get(board.zobrist_key)
+        if score is None:
+            if len(self.eval_cache) >= EVAL_CACHE_SIZE:
+                self.eval_cache.clear()
+            score = self.eval_cache[board.zobrist_key] = self.evaluate_board(board)
+        return score if board.turn == self.color else -score
+
+    def _evaluate_material(self, board):
+        """Bilan matériel et positionnel seul, du point de vue du camp au trait."""
+        score = 0
+        for color, sign in ((WHITE, 1), (BLACK, -1)):
+            tables = self.material_tables[color]
+            bitboards = board.bitboards[color]
+            for piece_type in range(6):
+                table = tables[piece_type]
+                for sq in iter_squares(bitboards[piece_type]):
+                    score += sign * table[sq]
+        return score if board.turn == "white" else -score
+
+    def _lazy_eval_margins(self, board):
+        """
+        Écarts (en dessous, au-dessus) de l'évaluation complète par rapport à _evaluate_material,
+        du point de vue du camp au trait. Les pénalités d'échange ne font que baisser le score de l'IA,
+        d'au plus HANGING_PIECE_PENALTY de son matériel (roi exclu : en échec, la quiescence n'évalue pas).
+        """
+        bitboards = board.bitboards[COLOR_INDEX[self.color]]
+        material = sum(popcount(bitboards[piece_type]) * self.piece_values[PIECE_NAMES[piece_type]]
+                       for piece_type in range(KING))
+        exchange = HANGING_PIECE_PENALTY * material
+        if board.turn == self.color:
+            return LAZY_EVAL_MARGIN + exchange, LAZY_EVAL_MARGIN
+        return LAZY_EVAL_MARGIN, LAZY_EVAL_MARGIN + exchange
+
     def get_capture_moves(self, board, color):
-        """Récupère tous les mouvements de capture pour une couleur donnée."""
-        captures = []
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, 'color') and piece.color == color:
-                    valid_moves = board.get_valid_moves(row, col)
-                    for end_row, end_col in valid_moves:
-                        target = board.get_piece(end_row, end_col)
-                        if target and hasattr(target, 'color') and target.color != color:
-                            captures.append(((row, col), (end_row, end_col)))
-        
-        return captures
+        """Récupère les prises et promotions en dame pour une couleur donnée."""
+        return generate_captures(board, color)
         
     def get_attacked_pieces(self, board):
         """Identifie les pièces attaquées par l'adversaire."""
         attacked = {}
         opponent_color = "white" if self.color == "black" else "black"
         
-        # Trouver toutes les cases attaquées par l'adversaire
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, 'color') and piece.color == opponent_color:
-                    valid_moves = board.get_valid_moves(row, col)
-                    for end_row, end_col in valid_moves:
-                        target = board.get_piece(end_row, end_col)
-                        if target and hasattr(target, 'color') and target.color == self.color:
-                            # Ajouter à la liste des pièces attaquées
-                            key = (end_row, end_col)
-                            if key not in attacked:
-                                attacked[key] = []
-                            attacked[key].append((row, col))
+        # Trouver toutes les cases attaquées par l'adversaire (seules les cases occupées sont visitées)
+        for row, col, piece in board.pieces(opponent_color):
+            valid_moves = board.get_valid_moves(row, col)
+            for end_row, end_col in valid_moves:
+                target = board.get_piece(end_row, end_col)
+                if target and hasattr(target, 'color') and target.color == self.color:
+                    # Ajouter à la liste des pièces attaquées
+                    key = (end_row, end_col)
+                    if key not in attacked:
+                        attacked[key] = []
+                    attacked[key].append((row, col))
         
         return attacked
         
@@ -1149,58 +1230,39 @@ class AI:
         defended = {}
         
         # Trouver toutes les cases défendues par des pièces alliées
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, 'color') and piece.color == self.color:
-                    valid_moves = board.get_valid_moves(row, col)
-                    for end_row, end_col in valid_moves:
-                        target = board.get_piece(end_row, end_col)
-                        if target and hasattr(target, 'color') and target.color == self.color:
-                            # Ajouter à la liste des pièces défendues
-                            key = (end_row, end_col)
-                            if key not in defended:
-                                defended[key] = []
-                            defended[key].append((row, col))
+        for row, col, piece in board.pieces(self.color):
+            valid_moves = board.get_valid_moves(row, col)
+            for end_row, end_col in valid_moves:
+                target = board.get_piece(end_row, end_col)
+                if target and hasattr(target, 'color') and target.color == self.color:
+                    # Ajouter à la liste des pièces défendues
+                    key = (end_row, end_col)
+                    if key not in defended:
+                        defended[key] = []
+                    defended[key].append((row, col))
         
         return defended
     
     def hash_board(self, board):
-        """Crée un hash du plateau pour la table de transposition."""
-        board_str = ""
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece == "":
-                    board_str += "."
-                else:
-                    piece_type = piece.__class__.__name__[0]
-                    if piece.color == "white":
-                        board_str += piece_type.upper()
-                    else:
-                        board_str += piece_type.lower()
-        
-        board_str += board.turn[0]  # Ajouter le tour actuel
-        return hash(board_str)
+        """Retourne la clé de Zobrist du plateau pour la table de transposition."""
+        return board.zobrist_key
     
-    @lru_cache(maxsize=1024)
     def evaluate_board(self, board):
         """Évalue la position actuelle du plateau avec une fonction d'évaluation avancée optimisée avec numpy."""
         start_time = time.time()
         
-        if board.check_game_status() == "Checkmate":
+        # Un seul calcul de l'état de la partie (mémorisé par position)
+        status = board.status()
+        if status.checkmate:
             # Si c'est échec et mat, retourner une valeur extrême
             if board.turn == self.color:
-                return -20000  # Nous avons perdu
+                return -MATE_SCORE  # Nous avons perdu
             else:
-                return 20000   # Nous avons gagné
+                return MATE_SCORE   # Nous avons gagné
         
-        if board.check_game_status() == "Stalemate":
+        if status.stalemate or status.draw:
             return 0  # Match nul
         
-        # Créer une représentation matricielle du plateau pour accélérer les calculs
-        board_matrix = self._create_board_matrix(board)
-        
         # Initialiser le score
         score = 0
         piece_count = {"white": 0, "black": 0}
@@ -1212,18 +1274,15 @@ class AI:
         # Évaluer la valeur matérielle et positionnelle avec numpy
         piece_positions = {}
         
-        # Collecter les positions des pièces par type et couleur
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, 'color'):
-                    piece_type = piece.__class__.__name__
-                    piece_count[piece.color] += 1
-                    
-                    key = f"{piece_type}_{piece.color}"
-                    if key not in piece_positions:
-                        piece_positions[key] = []
-                    piece_positions[key].append((row, col))
+        # Collecter les positions des pièces par type et couleur (cases occupées uniquement)
+        for row, col, piece in board.pieces():
+            piece_type = PIECE_NAMES[piece.piece_type]
+            piece_count[piece.color] += 1
+            
+            key = f"{piece_type}_{piece.color}"
+            if key not in piece_positions:
+                piece_positions[key] = []
+            piece_positions[key].append((row, col))
         
         # Calculer les scores matériels et positionnels en une seule passe
         for key, positions in piece_positions.items():
@@ -1297,17 +1356,12 @@ class AI:
         
         # Pénalité pour les pions doublés - utiliser numpy pour accélérer
         doubled_pawns_score = 0
+        white_pawn_bb = board.bitboards[WHITE][PAWN]
+        black_pawn_bb = board.bitboards[BLACK][PAWN]
         for col in range(8):
-            # Compter les pions par colonne avec numpy
-            white_pawns = sum(1 for row in range(8) if board.get_piece(row, col) and 
-                             hasattr(board.get_piece(row, col), '__class__') and 
-                             board.get_piece(row, col).__class__.__name__ == 'Pawn' and 
-                             board.get_piece(row, col).color == "white")
-            
-            black_pawns = sum(1 for row in range(8) if board.get_piece(row, col) and 
-                             hasattr(board.get_piece(row, col), '__class__') and 
-                             board.get_piece(row, col).__class__.__name__ == 'Pawn' and 
-                             board.get_piece(row, col).color == "black")
+            # Compter les pions par colonne à partir des bitboards
+            white_pawns = popcount(white_pawn_bb & (FILE_A << col))
+            black_pawns = popcount(black_pawn_bb & (FILE_A << col))
             
             # Pénaliser les pions doublés
             if white_pawns > 1:
@@ -1331,47 +1385,45 @@ class AI:
         white_pawn_mask = np.zeros((8, 8), dtype=bool)
         black_pawn_mask = np.zeros((8, 8), dtype=bool)
         
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, '__class__') and piece.__class__.__name__ == 'Pawn':
-                    if piece.color == "white":
-                        white_pawn_mask[row, col] = True
-                    else:
-                        black_pawn_mask[row, col] = True
-        
-        # Vérifier les pions passés
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, '__class__') and piece.__class__.__name__ == 'Pawn':
-                    is_passed = True
-                    
-                    # Vérifier s'il y a des pions adverses qui peuvent bloquer
-                    if piece.color == "white":
-                        # Vérifier devant le pion blanc
-                        for r in range(row-1, -1, -1):
-                            for c in range(max(0, col-1), min(8, col+2)):
-                                if black_pawn_mask[r, c]:
-                                    is_passed = False
-                                    break
-                    else:  # piece.color == "black"
-                        # Vérifier devant le pion noir
-                        for r in range(row+1, 8):
-                            for c in range(max(0, col-1), min(8, col+2)):
-                                if white_pawn_mask[r, c]:
-                                    is_passed = False
-                                    break
-                    
-                    if is_passed:
-                        # Bonus pour les pions passés, plus important en fin de partie
-                        if piece.color == self.color:
-                            # Plus le pion est avancé, plus le bonus est important
-                            rank_bonus = 7 - row if piece.color == "white" else row
-                            passed_pawns_score += (20 + rank_bonus * 10) * (2 if is_endgame else 1)
-                        else:
-                            rank_bonus = 7 - row if piece.color == "white" else row
-                            passed_pawns_score -= (20 + rank_bonus * 10) * (2 if is_endgame else 1)
+        pawn_squares = []
+        for sq in iter_squares(white_pawn_bb):
+            white_pawn_mask[sq >> 3, sq & 7] = True
+            pawn_squares.append(sq)
+        for sq in iter_squares(black_pawn_bb):
+            black_pawn_mask[sq >> 3, sq & 7] = True
+            pawn_squares.append(sq)
+        
+        # Vérifier les pions passés (seuls les pions sont visités)
+        for sq in pawn_squares:
+            row, col = sq >> 3, sq & 7
+            piece = board.get_piece(row, col)
+            is_passed = True
+            
+            # Vérifier s'il y a des pions adverses qui peuvent bloquer
+            if piece.color == "white":
+                # Vérifier devant le pion blanc
+                for r in range(row-1, -1, -1):
+                    for c in range(max(0, col-1), min(8, col+2)):
+                        if black_pawn_mask[r, c]:
+                            is_passed = False
+                            break
+            else:  # piece.color == "black"
+                # Vérifier devant le pion noir
+                for r in range(row+1, 8):
+                    for c in range(max(0, col-1), min(8, col+2)):
+                        if white_pawn_mask[r, c]:
+                            is_passed = False
+                            break
+            
+            if is_passed:
+                # Bonus pour les pions passés, plus important en fin de partie
+                if piece.color == self.color:
+                    # Plus le pion est avancé, plus le bonus est important
+                    rank_bonus = 7 - row if piece.color == "white" else row
+                    passed_pawns_score += (20 + rank_bonus * 10) * (2 if is_endgame else 1)
+                else:
+                    rank_bonus = 7 - row if piece.color == "white" else row
+                    passed_pawns_score -= (20 + rank_bonus * 10) * (2 if is_endgame else 1)
         
         score += passed_pawns_score
         
@@ -1414,12 +1466,11 @@ class AI:
         
         score += king_safety_score
         
-        # Vérifier si le roi est en échec
+        # Vérifier si le roi est en échec (seul le camp au trait peut l'être)
         check_score = 0
-        if board.is_king_in_check(self.color):
+        if status.check and board.turn == self.color:
             check_score -= 50  # Pénalité pour être en échec
-        
-        if board.is_king_in_check(opponent_color):
+        elif status.check:
             check_score += 50  # Bonus pour mettre l'adversaire en échec
         
         score += check_score
@@ -1428,22 +1479,21 @@ class AI:
         exchange_score = 0
         for (row, col), attackers in attacked_pieces.items():
             piece = board.get_piece(row, col)
-            if piece and hasattr(piece, '__class__'):
-                piece_type = piece.__class__.__name__
-                piece_value = self.piece_values.get(piece_type, 0)
+            if piece:
+                piece_type = PIECE_NAMES[piece.piece_type]
+                piece_value = self.piece_values[piece_type]
                 
                 # Vérifier si la pièce est défendue
                 is_defended = (row, col) in defended_pieces
                 
                 # Pénalité plus forte pour les pièces non défendues
                 if not is_defended:
-                    exchange_score -= piece_value * 0.3  # Pénalité sévère pour les pièces en danger
-                    self.log_thought(f"Pièce en danger non défendue: {piece_type} en {chr(col + ord('a'))}{8-row}")
+                    exchange_score -= piece_value * HANGING_PIECE_PENALTY  # Pénalité sévère pour les pièces en danger
+                    self.log_thought(f"Pièce en danger non défendue: {piece_type} en {SQUARE_NAMES[row * 8 + col]}")
                 else:
                     # Évaluer l'échange
-                    attacker_values = [self.piece_values.get(board.get_piece(r, c).__class__.__name__, 0) 
-                                      for r, c in attackers 
-                                      if board.get_piece(r, c) and hasattr(board.get_piece(r, c), '__class__')]
+                    attacker_values = [self.piece_values[PIECE_NAMES[board.get_piece(r, c).piece_type]]
+                                      for r, c in attackers if board.get_piece(r, c)]
                     
                     if attacker_values:
                         lowest_attacker_value = min(attacker_values)
@@ -1467,87 +1517,31 @@ class AI:
         # 6 types de pièces * 2 couleurs = 12 canaux
         matrix = np.zeros((8, 8, 12), dtype=np.int8)
         
-        piece_types = ["Pawn", "Knight", "Bishop", "Rook", "Queen", "King"]
-        colors = ["white", "black"]
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, '__class__'):
-                    piece_type = piece.__class__.__name__
-                    if piece_type in piece_types and hasattr(piece, 'color') and piece.color in colors:
-                        type_idx = piece_types.index(piece_type)
-                        color_idx = colors.index(piece.color)
-                        channel_idx = type_idx + 6 * color_idx
-                        matrix[row, col, channel_idx] = 1
+        for row, col, piece in board.pieces():
+            matrix[row, col, piece.piece_type + 6 * COLOR_INDEX[piece.color]] = 1
         
         return matrix
     
     def get_all_valid_moves(self, board, color):
-        """Récupère tous les mouvements valides pour une couleur donnée de manière optimisée."""
-        all_moves = []
+        """Récupère tous les mouvements légaux (coups 16 bits) pour une couleur donnée."""
+        # Pour le camp au trait, les coups sont déjà dans le statut mémorisé de la position
+        if color == board.turn:
+            all_moves = list(board.status().moves)
+        else:
+            all_moves = list(generate_moves(board, color))
         
-        # Optimisation : vérifier d'abord les pièces qui ont le plus de mouvements potentiels
         # Ordre de priorité : Dame, Tour, Fou, Cavalier, Roi, Pion
-        piece_positions = []
-        
-        # Collecter toutes les positions des pièces de la couleur donnée
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and hasattr(piece, 'color') and piece.color == color:
-                    piece_type = piece.__class__.__name__
-                    # Attribuer une priorité à chaque type de pièce
-                    priority = {
-                        "Queen": 0,
-                        "Rook": 1,
-                        "Bishop": 2,
-                        "Knight": 3,
-                        "King": 4,
-                        "Pawn": 5
-                    }.get(piece_type, 6)
-                    piece_positions.append((priority, row, col))
-        
-        # Trier les positions par priorité
-        piece_positions.sort()
-        
-        # Limiter le nombre de mouvements à vérifier si le temps est critique
-        max_pieces_to_check = len(piece_positions)
-        
-        # Récupérer les mouvements valides pour chaque pièce
-        for _, row, col in piece_positions[:max_pieces_to_check]:
-            try:
-                valid_moves = board.get_valid_moves(row, col)
-                for end_row, end_col in valid_moves:
-                    all_moves.append(((row, col), (end_row, end_col)))
-                    
-                    # Si nous avons déjà trouvé beaucoup de mouvements, c'est suffisant
-                    if len(all_moves) > 50:  # Limite arbitraire pour éviter de passer trop de temps
-                        return all_moves
-            except Exception as e:
-                # En cas d'erreur, continuer avec les autres pièces
-                continue
-        
-        # Si aucun mouvement n'a été trouvé, vérifier toutes les pièces sans optimisation
-        if not all_moves:
-            for row in range(8):
-                for col in range(8):
-                    piece = board.get_piece(row, col)
-                    if piece and hasattr(piece, 'color') and piece.color == color:
-                        try:
-                            valid_moves = board.get_valid_moves(row, col)
-                            for end_row, end_col in valid_moves:
-                                all_moves.append(((row, col), (end_row, end_col)))
-                        except Exception:
-                            continue
-        
+        # (tous les coups sont gardés : la recherche les trie elle-même par étapes)
+        priority = {QUEEN: 0, ROOK: 1, BISHOP: 2, KNIGHT: 3, KING: 4, PAWN: 5}
+        grid = board.board
+        all_moves.sort(key=lambda move: priority[grid[move_from(move) >> 3][move_from(move) & 7].piece_type])
         return all_moves
     
     def record_move(self, board, move, score):
         """Enregistre un mouvement dans l'historique pour l'apprentissage."""
         board_state = self.get_board_state(board)
         start_pos, end_pos = move
-        move_notation = f"{chr(start_pos[1] + ord('a'))}{8 - start_pos[0]}{chr(end_pos[1] + ord('a'))}{8 - end_pos[0]}"
+        move_notation = to_uci(Move(start_pos, end_pos).value)
         
         # Ajouter à l'historique de la partie
         self.game_history.append((board_state, move_notation, score))
@@ -1581,8 +1575,9 @@ class AI:
         
         # Mettre à jour les données d'apprentissage
         for board_state, move_notation, _ in self.game_history:
-            move_key = move_notation.replace(move_notation[0], str(ord(move_notation[0]) - ord('a'))).replace(move_notation[2], str(ord(move_notation[2]) - ord('a')))
-            move_key = move_key.replace(move_notation[1], str(8 - int(move_notation[1]))).replace(move_notation[3], str(8 - int(move_notation[3])))
+            # Même clé "ligne/colonne" que celle lue par order_moves
+            (start_row, start_col), (end_row, end_col) = self.parse_move_notation(move_notation)
+            move_key = f"{start_row}{start_col}{end_row}{end_col}"
             
             if move_key not in self.learning_data:
                 self.learning_data[move_key] = 0.5  # Valeur initiale neutre
@@ -1596,7 +1591,12 @@ class AI:
         # Sauvegarder la base de données d'ouvertures
         self.save_opening_book()
         
-        # Réinitialiser l'historique de la partie
+        # Réinitialiser l'historique et la table de transposition pour la partie suivante
+        self.new_game()
+    
+    def new_game(self):
+        """Prépare l'IA pour une nouvelle partie : les recherches de la partie précédente sont oubliées."""
+        self.transposition_table.clear()
         self.game_history = []
     
     def load_opening_book(self):
@@ -0,0 +1,112 @@
+# bitboard.py
+
+"""
+Représentation bitboard de l'échiquier.
+
+Chaque case est un bit d'un entier 64 bits : case = ligne * 8 + colonne,
+avec la ligne 0 correspondant à la 8e rangée (a8 = bit 0, h1 = bit 63),
+comme les indices (row, col) utilisés partout ailleurs dans le jeu.
+"""
+
+WHITE, BLACK = 0, 1
+COLORS = ("white", "black")
+COLOR_INDEX = {"white": WHITE, "black": BLACK}
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PIECE_NAMES = ("Pawn", "Knight", "Bishop", "Rook", "Queen", "King")
+
+FULL = (1 << 64) - 1
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+NOT_FILE_A = FULL ^ FILE_A
+NOT_FILE_H = FULL ^ FILE_H
+NOT_FILE_AB = NOT_FILE_A & (FULL ^ (FILE_A << 1))
+NOT_FILE_GH = NOT_FILE_H & (FULL ^ (FILE_A << 6))
+
+
+def square(row, col):
+    """Retourne l'indice de case (0-63) pour la position (row, col)."""
+    return row * 8 + col
+
+
+def square_to_position(sq):
+    """Retourne la position (row, col) d'un indice de case."""
+    return sq >> 3, sq & 7
+
+
+def lsb(bb):
+    """Retourne l'indice du bit de poids faible (le bitboard ne doit pas être vide)."""
+    return (bb & -bb).bit_length() - 1
+
+
+def msb(bb):
+    """Retourne l'indice du bit de poids fort (le bitboard ne doit pas être vide)."""
+    return bb.bit_length() - 1
+
+
+def popcount(bb):
+    """Compte le nombre de bits à 1."""
+    return bin(bb).count("1")
+
+
+def iter_squares(bb):
+    """Itère sur les indices des cases présentes dans le bitboard."""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+# Décalages d'un bitboard entier d'une case dans chaque direction
+def north(bb):
+    return bb >> 8
+
+
+def south(bb):
+    return (bb << 8) & FULL
+
+
+def east(bb):
+    return (bb << 1) & NOT_FILE_A
+
+
+def west(bb):
+    return (bb >> 1) & NOT_FILE_H
+
+
+def north_east(bb):
+    return east(north(bb))
+
+
+def north_west(bb):
+    return west(north(bb))
+
+
+def south_east(bb):
+    return east(south(bb))
+
+
+def south_west(bb):
+    return west(south(bb))
+
+
+def knight_attacks(bb):
+    """Cases attaquées par des cavaliers placés sur le bitboard."""
+    return (
+        ((bb >> 17) & NOT_FILE_H) | ((bb >> 15) & NOT_FILE_A)
+        | ((bb >> 10) & NOT_FILE_GH) | ((bb >> 6) & NOT_FILE_AB)
+        | ((bb << 6) & NOT_FILE_GH) | ((bb << 10) & NOT_FILE_AB)
+        | ((bb << 15) & NOT_FILE_H) | ((bb << 17) & NOT_FILE_A)
+    ) & FULL
+
+
+def king_attacks(bb):
+    """Cases attaquées par des rois placés sur le bitboard."""
+    row = bb | east(bb) | west(bb)
+    return (row | north(row) | south(row)) ^ bb
+
+
+def pawn_attacks(bb, color):
+    """Cases attaquées en diagonale par des pions de la couleur donnée (WHITE/BLACK)."""
+    forward = north(bb) if color == WHITE else south(bb)
+    return east(forward) | west(forward)
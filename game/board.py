@@ -9,8 +9,63 @@ from game.pieces.pawn import Pawn
 from game.rules.movement_rules import MovementRules
 from game.rules.game_rules import GameRules
 import pandas as pd
-from game.move import Move
+from game.move import Move, SQUARE_NAMES, promotion_of, to_positions
+from game.rules.move_generator import generate_moves
 from game.history import GameHistory
+from collections import namedtuple
+from game.bitboard import (
+    WHITE, BLACK, COLOR_INDEX, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+    square, square_to_position, lsb, iter_squares,
+)
+from game.rules.attack_tables import (
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, rook_attacks, bishop_attacks,
+)
+from game.zobrist import (
+    PIECE_KEYS, BLACK_TO_MOVE_KEY, CASTLING_KEYS, EP_FILE_KEYS,
+    WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE,
+)
+
+# Pièces disponibles pour la promotion d'un pion
+PROMOTION_PIECES = {
+    "Q": Queen,
+    "R": Rook,
+    "B": Bishop,
+    "N": Knight
+}
+
+# Pièces correspondant aux lettres de la notation FEN
+FEN_PIECES = {
+    "p": Pawn,
+    "n": Knight,
+    "b": Bishop,
+    "r": Rook,
+    "q": Queen,
+    "k": King
+}
+
+# Règles partagées par tous les plateaux (elles ne portent aucun état)
+MOVEMENT_RULES = MovementRules()
+GAME_RULES = GameRules()
+
+ALL_CASTLING = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+
+# Droits de roque conservés quand une pièce quitte ou atteint chaque case (roi et tours d'origine)
+_CASTLING_LOST = {60: WHITE_KINGSIDE | WHITE_QUEENSIDE, 63: WHITE_KINGSIDE, 56: WHITE_QUEENSIDE,
+                  4: BLACK_KINGSIDE | BLACK_QUEENSIDE, 7: BLACK_KINGSIDE, 0: BLACK_QUEENSIDE}
+CASTLING_MASKS = tuple(ALL_CASTLING & ~_CASTLING_LOST.get(sq, 0) for sq in range(64))
+
+# Enregistrement compact empilé par make_move pour pouvoir annuler le coup
+UndoRecord = namedtuple("UndoRecord", [
+    "start", "end", "piece", "captured", "captured_pos", "castle", "castling_rights", "ep_square",
+    "halfmove_clock", "key"
+])
+
+# État de la partie pour le camp au trait : moves contient ses coups légaux (coups 16 bits)
+GameStatus = namedtuple("GameStatus", ["check", "checkmate", "stalemate", "draw", "moves"])
+
+# Statuts déjà calculés, indexés par clé de Zobrist (partagés par tous les plateaux)
+_STATUS_CACHE = {}
+STATUS_CACHE_SIZE = 1 << 16
 
 class Board:
     def __init__(self):
@@ -25,21 +80,107 @@ class Board:
             [Pawn("white")]*8,
             [Rook("white"), Knight("white"), Bishop("white"), Queen("white"), King("white"), Bishop("white"), Knight("white"), Rook("white")]
         ]
-        self.movement_rules = MovementRules()
-        self.game_rules = GameRules()
+        self.movement_rules = MOVEMENT_RULES
+        self.game_rules = GAME_RULES
         self.turn = "white"
         self.opponent = "black"
-        self.history = GameHistory()
+        self._history = None  # Créé au premier accès (inutile pour les plateaux de recherche)
         self.move_count = 1
         self.promotion_pending = None  # Pour stocker les informations sur un pion en attente de promotion
+        self.ep_square = None  # Case (0-63) de prise en passant possible, ou None
+        self.castling_rights = ALL_CASTLING  # Bits KQkq (voir game.zobrist)
+        self.halfmove_clock = 0  # Demi-coups depuis la dernière prise ou poussée de pion (règle des 50 coups)
+        self.fullmove_number = 1  # Numéro du coup, incrémenté après chaque coup des noirs
+        self.undo_stack = []  # Enregistrements des coups joués avec make_move
+        self._sync_bitboards()
+
+    def _sync_bitboards(self):
+        """Reconstruit les bitboards à partir de la grille 8x8."""
+        # Un entier 64 bits par (couleur, type de pièce) et un masque d'occupation par couleur
+        self.bitboards = [[0] * 6, [0] * 6]
+        self.occupancy = [0, 0]
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece != "":
+                    color = COLOR_INDEX[piece.color]
+                    mask = 1 << square(row, col)
+                    self.bitboards[color][piece.piece_type] |= mask
+                    self.occupancy[color] |= mask
+        self.occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+        self.zobrist_key = self._compute_zobrist_key()
+
+    def __setstate__(self, state):
+        """Restaure un plateau picklé, y compris ceux sauvegardés avant les bitboards."""
+        state = dict(state)
+        if "history" in state:
+            state["_history"] = state.pop("history")
+        self.__dict__.update(state)
+        # Les pièces des anciennes sauvegardes sont remplacées par les instances partagées
+        self.board = [[piece if piece == "" else piece.shared() for piece in row] for row in self.board]
+        # Règles partagées plutôt que les copies picklées
+        self.movement_rules = MOVEMENT_RULES
+        self.game_rules = GAME_RULES
+        for name, default in (("_history", None), ("move_count", 1), ("promotion_pending", None),
+                              ("ep_square", None), ("halfmove_clock", 0), ("undo_stack", [])):
+            if name not in state:
+                setattr(self, name, default)
+        if "opponent" not in state:
+            self.opponent = "black" if self.turn == "white" else "white"
+        if "fullmove_number" not in state:
+            self.fullmove_number = self.move_count
+        if "castling_rights" not in state:
+            self.castling_rights = self._castling_rights_from_grid()
+        # Bitboards, occupation et clé de Zobrist sont toujours recalculés depuis la grille
+        self._sync_bitboards()
+
+    def _compute_zobrist_key(self):
+        """Calcule la clé de Zobrist de la position à partir de zéro."""
+        key = 0
+        for color in (WHITE, BLACK):
+            for piece_type in range(6):
+                for sq in iter_squares(self.bitboards[color][piece_type]):
+                    key ^= PIECE_KEYS[color][piece_type][sq]
+        if self.turn == "black":
+            key ^= BLACK_TO_MOVE_KEY
+        key ^= CASTLING_KEYS[self.castling_rights]
+        if self.ep_square is not None:
+            key ^= EP_FILE_KEYS[self.ep_square & 7]
+        return key
+
+    def _castling_rights_from_grid(self):
+        """Droits de roque compatibles avec la grille : roi et tour sur leurs cases d'origine."""
+        rights = 0
+        for row, color, kingside, queenside in ((7, "white", WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                                (0, "black", BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            king = self.board[row][4]
+            if isinstance(king, King) and king.color == color:
+                for col, flag in ((7, kingside), (0, queenside)):
+                    rook = self.board[row][col]
+                    if isinstance(rook, Rook) and rook.color == color:
+                        rights |= flag
+        return rights
+
+    @property
+    def history(self):
+        """Historique des coups, créé à la demande."""
+        if self._history is None:
+            self._history = GameHistory()
+        return self._history
+
+    @history.setter
+    def history(self, history):
+        self._history = history
 
     def get_board(self):
         """Retourne la pièce à la position (row, col)"""
         return self.board
     
     def set_board(self, board):
-        """Place une pièce à la position (row, col)"""
+        """Remplace la grille 8x8 et reconstruit les bitboards."""
         self.board = board
+        self.castling_rights &= self._castling_rights_from_grid()
+        self._sync_bitboards()
     
     def get_piece(self, row, col):
         """Retourne la pièce à la position (row, col)"""
@@ -47,6 +188,19 @@ class Board:
     
     def set_piece(self, row, col, piece):
         """Place une pièce à la position (row, col)"""
+        mask = 1 << square(row, col)
+        old = self.board[row][col]
+        if old != "":
+            color = COLOR_INDEX[old.color]
+            self.bitboards[color][old.piece_type] &= ~mask
+            self.occupancy[color] &= ~mask
+            self.zobrist_key ^= PIECE_KEYS[color][old.piece_type][row * 8 + col]
+        if piece != "":
+            color = COLOR_INDEX[piece.color]
+            self.bitboards[color][piece.piece_type] |= mask
+            self.occupancy[color] |= mask
+            self.zobrist_key ^= PIECE_KEYS[color][piece.piece_type][row * 8 + col]
+        self.occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
         self.board[row][col] = piece
     
     def get(self):
@@ -56,26 +210,33 @@ class Board:
         return self.turn
     
     def copy(self):
-        """Crée une copie profonde du plateau."""
-        import copy
-        new_board = Board()
-        
-        # Copie profonde du plateau
-        board_copy = []
-        for row in self.board:
-            new_row = []
-            for piece in row:
-                if piece == "":
-                    new_row.append("")
-                else:
-                    # Copie profonde de la pièce
-                    new_row.append(copy.deepcopy(piece))
-            board_copy.append(new_row)
-            
-        new_board.set_board(board_copy)
+        """Crée une copie indépendante du plateau (voir clone_position)."""
+        return self.clone_position()
+
+    def clone_position(self):
+        """
+        Copie uniquement l'état de la position (grille, bitboards, trait, prise en passant,
+        clé de Zobrist), sans reconstruire de pièces de départ ni d'historique.
+        """
+        new_board = Board.__new__(Board)
+        # Les pièces sont immuables et partagées : seules les rangées sont copiées
+        new_board.board = [row[:] for row in self.board]
+        new_board.movement_rules = MOVEMENT_RULES
+        new_board.game_rules = GAME_RULES
         new_board.turn = self.turn
         new_board.opponent = self.opponent
+        new_board._history = None
         new_board.move_count = self.move_count
+        new_board.promotion_pending = None
+        new_board.ep_square = self.ep_square
+        new_board.castling_rights = self.castling_rights
+        new_board.halfmove_clock = self.halfmove_clock
+        new_board.fullmove_number = self.fullmove_number
+        new_board.undo_stack = []
+        new_board.bitboards = [self.bitboards[WHITE][:], self.bitboards[BLACK][:]]
+        new_board.occupancy = self.occupancy[:]
+        new_board.occupied = self.occupied
+        new_board.zobrist_key = self.zobrist_key
         return new_board
 
     def get_valid_moves(self, row, col):
@@ -84,13 +245,45 @@ class Board:
             return []
         return self.movement_rules.get_valid_moves(piece, row, col, self)
 
+    def status(self):
+        """
+        Retourne le GameStatus du camp au trait. Les coups légaux ne sont générés
+        qu'une fois par position : le résultat est mémorisé par clé de Zobrist.
+        """
+        cached = _STATUS_CACHE.get(self.zobrist_key)
+        if cached is None:
+            us = COLOR_INDEX[self.turn]
+            king = self.bitboards[us][KING]
+            check = bool(king) and bool(self.attackers_to(lsb(king), 1 - us))
+            moves = generate_moves(self)
+            insufficient = self.is_insufficient_material()
+            cached = GameStatus(check, check and not moves, not check and not moves, insufficient, moves)
+            if len(_STATUS_CACHE) >= STATUS_CACHE_SIZE:
+                _STATUS_CACHE.clear()
+            _STATUS_CACHE[self.zobrist_key] = cached
+        # La règle des 50 coups dépend d'un compteur absent de la clé
+        if self.halfmove_clock >= 100 and not cached.draw and not cached.checkmate:
+            return cached._replace(draw=True)
+        return cached
+
+    def is_insufficient_material(self):
+        """Vrai s'il ne reste que les rois et au plus une pièce mineure."""
+        white, black = self.bitboards
+        if white[PAWN] | black[PAWN] | white[ROOK] | black[ROOK] | white[QUEEN] | black[QUEEN]:
+            return False
+        minors = white[KNIGHT] | black[KNIGHT] | white[BISHOP] | black[BISHOP]
+        return not minors & (minors - 1)
+
     def check_game_status(self):
-        if self.game_rules.is_checkmate(self, self.turn):
+        status = self.status()
+        if status.checkmate:
             return "Checkmate"
-        elif self.game_rules.is_check(self, self.turn):
+        elif status.check:
             return "Check"
-        elif self.game_rules.is_stalemate(self, self.turn):
+        elif status.stalemate:
             return "Stalemate"
+        elif status.draw:
+            return "Draw"
         return "In Progress"
     
     def chess_notation_to_index(self, notation):
@@ -101,6 +294,123 @@ class Board:
         row = 8 - int(notation[1])
         return row, col
 
+    def make_move(self, move, promotion="Q"):
+        """
+        Joue un coup ((row, col), (row, col)) ou un coup 16 bits (game.move) sans le
+        valider et empile de quoi l'annuler avec unmake_move. Gère le roque et la prise
+        en passant. Un pion atteignant la dernière rangée est promu en `promotion`
+        ('Q', 'R', 'B', 'N'), ou reste un pion si promotion vaut None ; un coup 16 bits
+        porte sa propre pièce de promotion.
+        """
+        if isinstance(move, int):
+            promotion = promotion_of(move) or promotion
+            move = to_positions(move)
+        (start_row, start_col), (end_row, end_col) = move[0], move[1]
+        piece = self.board[start_row][start_col]
+        captured = self.board[end_row][end_col]
+        captured_pos = (end_row, end_col)
+        castle = None
+        key = self.zobrist_key
+        rights = self.castling_rights
+        promoting = promotion and isinstance(piece, Pawn) and end_row in (0, 7)
+
+        if isinstance(piece, Pawn):
+            # Prise en passant : déplacement en diagonale vers une case vide
+            if captured == "" and start_col != end_col:
+                captured_pos = (start_row, end_col)
+                captured = self.board[start_row][end_col]
+                self.set_piece(start_row, end_col, "")
+        elif isinstance(piece, King) and abs(start_col - end_col) == 2:
+            # Roque : déplacer aussi la tour
+            castle = (7, 5) if end_col == 6 else (0, 3)
+            rook = self.board[start_row][castle[0]]
+            self.set_piece(start_row, castle[1], rook)
+            self.set_piece(start_row, castle[0], "")
+
+        self.undo_stack.append(UndoRecord(
+            move[0], move[1], piece, captured, captured_pos, castle, rights, self.ep_square,
+            self.halfmove_clock, key
+        ))
+
+        # Une prise ou un coup de pion remet à zéro le compteur de la règle des 50 coups
+        if captured != "" or isinstance(piece, Pawn):
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if piece.color == "black":
+            self.fullmove_number += 1
+
+        # Un roi ou une tour qui quitte sa case d'origine, ou une tour prise, perd son droit de roque
+        new_rights = rights & CASTLING_MASKS[start_row * 8 + start_col] & CASTLING_MASKS[end_row * 8 + end_col]
+        if new_rights != rights:
+            self.zobrist_key ^= CASTLING_KEYS[rights] ^ CASTLING_KEYS[new_rights]
+            self.castling_rights = new_rights
+
+        # Une double poussée de pion ouvre la prise en passant sur la case sautée
+        if self.ep_square is not None:
+            self.zobrist_key ^= EP_FILE_KEYS[self.ep_square & 7]
+        self.ep_square = None
+        if isinstance(piece, Pawn) and abs(start_row - end_row) == 2:
+            self.ep_square = square((start_row + end_row) // 2, start_col)
+            self.zobrist_key ^= EP_FILE_KEYS[start_col]
+
+        moved_piece = piece
+        if promoting:
+            moved_piece = PROMOTION_PIECES[promotion](piece.color)
+
+        self.set_piece(end_row, end_col, moved_piece)
+        self.set_piece(start_row, start_col, "")
+        self.turn, self.opponent = self.opponent, self.turn
+        self.zobrist_key ^= BLACK_TO_MOVE_KEY
+
+    def unmake_move(self):
+        """Annule le dernier coup joué avec make_move."""
+        record = self.undo_stack.pop()
+        start_row, start_col = record.start
+        end_row, end_col = record.end
+
+        self.turn, self.opponent = self.opponent, self.turn
+        self.set_piece(end_row, end_col, "")
+        self.set_piece(start_row, start_col, record.piece)
+        if record.captured != "":
+            self.set_piece(record.captured_pos[0], record.captured_pos[1], record.captured)
+
+        if record.castle:
+            rook = self.board[start_row][record.castle[1]]
+            self.set_piece(start_row, record.castle[0], rook)
+            self.set_piece(start_row, record.castle[1], "")
+
+        self.castling_rights = record.castling_rights
+        self.ep_square = record.ep_square
+        self.halfmove_clock = record.halfmove_clock
+        if record.piece.color == "black":
+            self.fullmove_number -= 1
+        self.zobrist_key = record.key
+
+    def make_null_move(self):
+        """
+        Passe le trait sans bouger de pièce (coup nul, utilisé par la recherche) : seuls
+        le trait, la case de prise en passant et la clé changent. À annuler avec unmake_null_move.
+        """
+        self.undo_stack.append(UndoRecord(
+            None, None, None, "", None, None, self.castling_rights, self.ep_square,
+            self.halfmove_clock, self.zobrist_key
+        ))
+        if self.ep_square is not None:
+            self.zobrist_key ^= EP_FILE_KEYS[self.ep_square & 7]
+            self.ep_square = None
+        self.halfmove_clock += 1
+        self.turn, self.opponent = self.opponent, self.turn
+        self.zobrist_key ^= BLACK_TO_MOVE_KEY
+
+    def unmake_null_move(self):
+        """Annule le dernier coup nul joué avec make_null_move."""
+        record = self.undo_stack.pop()
+        self.turn, self.opponent = self.opponent, self.turn
+        self.ep_square = record.ep_square
+        self.halfmove_clock = record.halfmove_clock
+        self.zobrist_key = record.key
+
     def execute_move(self, start, end):
         start_row, start_col = self.chess_notation_to_index(start)
         end_row, end_col = self.chess_notation_to_index(end)
@@ -111,57 +421,10 @@ class Board:
             print("Invalid move")
             return False
 
-        # Marquer la pièce comme ayant bougé
-        if isinstance(piece, King) or isinstance(piece, Rook):
-            piece.has_moved = True
-
-        # Handle castling (roque)
-        if isinstance(piece, King) and abs(start_col - end_col) == 2:
-            # Petit roque (kingside)
-            if end_col == 6:
-                rook = self.board[start_row][7]
-                self.board[start_row][5] = rook  # Déplacer la tour
-                self.board[start_row][7] = ""    # Vider la case de la tour
-                if isinstance(rook, Rook):
-                    rook.has_moved = True
-            # Grand roque (queenside)
-            elif end_col == 2:
-                rook = self.board[start_row][0]
-                self.board[start_row][3] = rook  # Déplacer la tour
-                self.board[start_row][0] = ""    # Vider la case de la tour
-                if isinstance(rook, Rook):
-                    rook.has_moved = True
-
-        # Handle en passant capture
-        if isinstance(piece, Pawn) and abs(start_col - end_col) == 1 and self.board[end_row][end_col] == "":
-            if piece.color == "white" and start_row == 3 and end_row == 2:
-                self.board[start_row][end_col] = ""  # Remove the captured pawn
-            elif piece.color == "black" and start_row == 4 and end_row == 5:
-                self.board[start_row][end_col] = ""  # Remove the captured pawn
-
-        # Déplacer la pièce
-        self.board[end_row][end_col] = piece
-        self.board[start_row][start_col] = ""
-
-        # Vérifier si le roi est en échec après le mouvement
-        if self.is_king_in_check(self.turn):
-            print("Move puts king in check")
-            # Annuler le mouvement
-            self.board[start_row][start_col] = piece
-            self.board[end_row][end_col] = ""
-            
-            # Annuler le roque si c'était un roque
-            if isinstance(piece, King) and abs(start_col - end_col) == 2:
-                if end_col == 6:  # Petit roque
-                    rook = self.board[start_row][5]
-                    self.board[start_row][7] = rook
-                    self.board[start_row][5] = ""
-                elif end_col == 2:  # Grand roque
-                    rook = self.board[start_row][3]
-                    self.board[start_row][0] = rook
-                    self.board[start_row][3] = ""
-            
-            return False
+        # Les coups valides sont légaux : le coup ne peut pas laisser le roi en échec.
+        # Jouer le coup (roque et prise en passant compris), la promotion est demandée à part.
+        # make_move met aussi à jour les droits de roque, la prise en passant et les compteurs
+        self.make_move(((start_row, start_col), (end_row, end_col)), promotion=None)
 
         # Gérer la promotion des pions
         if isinstance(piece, Pawn):
@@ -177,32 +440,30 @@ class Board:
         # Préparer le message pour l'historique
         move_message = f"{piece} moved from {start} to {end}"
         
-        # Changer de tour
-        next_turn = "black" if self.turn == "white" else "white"
-        next_opponent = "white" if next_turn == "black" else "black"
+        # make_move a déjà changé de tour
+        mover = self.opponent
+        next_turn = self.turn
         
         # Vérifier si le roi adverse est en échec ou échec et mat
-        if self.is_king_in_check(next_turn):
-            if self.is_checkmate(next_turn):
-                move_message += f" - ÉCHEC ET MAT ! {self.turn.capitalize()} gagne."
+        status = self.status()
+        if status.check:
+            if status.checkmate:
+                move_message += f" - ÉCHEC ET MAT ! {mover.capitalize()} gagne."
             else:
                 move_message += f" - ÉCHEC au roi {next_turn} !"
         
         # Add move to history
         self.history.add_move(
             self.move_count,
-            self.turn.capitalize(),
+            mover.capitalize(),
             (start_row, start_col),
             (end_row, end_col),
             piece,
             move_message
         )
-        if self.turn == "black":
+        if mover == "black":
             self.move_count += 1
 
-        # Mettre à jour le tour
-        self.turn = next_turn
-        self.opponent = next_opponent
         self.history.display_history()
         return True
     
@@ -238,96 +499,69 @@ class Board:
 
     def find_king(self, color):
         """Trouve la position du roi de la couleur donnée."""
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece == "":  # Case vide
-                    continue
-                if isinstance(piece, King) and piece.color == color:
-                    return (row, col)
-        return None
+        # Le bitboard du roi est tenu à jour par set_piece : pas de parcours de la grille
+        kings = self.bitboards[COLOR_INDEX[color]][KING]
+        if not kings:
+            return None
+        return square_to_position(lsb(kings))
+
+    def pieces(self, color=None):
+        """
+        Retourne la liste des (row, col, pièce) occupées par la couleur donnée
+        (toutes les pièces par défaut), en ne visitant que les cases occupées.
+        """
+        occupied = self.occupied if color is None else self.occupancy[COLOR_INDEX[color]]
+        board = self.board
+        return [(sq >> 3, sq & 7, board[sq >> 3][sq & 7]) for sq in iter_squares(occupied)]
 
     def is_square_attacked(self, position, color, return_attacker=False):
         """
         Vérifie si une case est attaquée par une pièce de l'adversaire.
         Si return_attacker est True, retourne la pièce attaquante et sa position.
         """
-        opponent_color = "white" if color == "black" else "black"
         target_row, target_col = position
-        
-        # Vérifier les attaques des pions
-        pawn_directions = [(-1, -1), (-1, 1)] if color == "white" else [(1, -1), (1, 1)]
-        for d_row, d_col in pawn_directions:
-            r, c = target_row + d_row, target_col + d_col
-            if 0 <= r < 8 and 0 <= c < 8:
-                piece = self.board[r][c]
-                if piece != "" and piece.color == opponent_color and isinstance(piece, Pawn):
-                    if return_attacker:
-                        return True, (r, c), piece
-                    return True
-        
-        # Vérifier les attaques des cavaliers
-        knight_moves = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-        for d_row, d_col in knight_moves:
-            r, c = target_row + d_row, target_col + d_col
-            if 0 <= r < 8 and 0 <= c < 8:
-                piece = self.board[r][c]
-                if piece != "" and piece.color == opponent_color and isinstance(piece, Knight):
-                    if return_attacker:
-                        return True, (r, c), piece
-                    return True
-        
-        # Vérifier les attaques en ligne (tour et dame)
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        for d_row, d_col in directions:
-            r, c = target_row, target_col
-            while True:
-                r += d_row
-                c += d_col
-                if not (0 <= r < 8 and 0 <= c < 8):
-                    break
-                piece = self.board[r][c]
-                if piece == "":
-                    continue
-                if piece.color == opponent_color and (isinstance(piece, Rook) or isinstance(piece, Queen)):
-                    if return_attacker:
-                        return True, (r, c), piece
-                    return True
-                break  # Une pièce bloque la ligne
-        
-        # Vérifier les attaques en diagonale (fou et dame)
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-        for d_row, d_col in directions:
-            r, c = target_row, target_col
-            while True:
-                r += d_row
-                c += d_col
-                if not (0 <= r < 8 and 0 <= c < 8):
-                    break
-                piece = self.board[r][c]
-                if piece == "":
-                    continue
-                if piece.color == opponent_color and (isinstance(piece, Bishop) or isinstance(piece, Queen)):
-                    if return_attacker:
-                        return True, (r, c), piece
-                    return True
-                break  # Une pièce bloque la diagonale
-        
-        # Vérifier les attaques du roi
-        king_moves = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
-        for d_row, d_col in king_moves:
-            r, c = target_row + d_row, target_col + d_col
-            if 0 <= r < 8 and 0 <= c < 8:
-                piece = self.board[r][c]
-                if piece != "" and piece.color == opponent_color and isinstance(piece, King):
-                    if return_attacker:
-                        return True, (r, c), piece
-                    return True
-                    
+        sq = square(target_row, target_col)
+        us = COLOR_INDEX[color]
+        enemy = self.bitboards[1 - us]
+        rooks = enemy[ROOK] | enemy[QUEEN]
+        bishops = enemy[BISHOP] | enemy[QUEEN]
+
+        # Chaque masque est calculé depuis la case cible : une pièce adverse
+        # présente sur une case atteinte "à l'envers" attaque la cible.
+        # L'ordre (pion, cavalier, lignes, diagonales, roi) est celui de l'ancienne recherche.
+        attackers = PAWN_ATTACKS[us][sq] & enemy[PAWN]
+        if not attackers:
+            attackers = KNIGHT_ATTACKS[sq] & enemy[KNIGHT]
+        if not attackers and rooks:
+            attackers = rook_attacks(sq, self.occupied) & rooks
+        if not attackers and bishops:
+            attackers = bishop_attacks(sq, self.occupied) & bishops
+        if not attackers:
+            attackers = KING_ATTACKS[sq] & enemy[KING]
+
         if return_attacker:
-            return False, None, None
-        return False
+            if not attackers:
+                return False, None, None
+            r, c = square_to_position(lsb(attackers))
+            return True, (r, c), self.board[r][c]
+        return attackers != 0
     
+    def attackers_to(self, sq, color, occupied=None):
+        """
+        Retourne le bitboard des pièces de la couleur `color` (WHITE/BLACK) qui attaquent
+        la case sq. `occupied` permet de calculer les rayons avec une autre occupation.
+        """
+        pieces = self.bitboards[color]
+        if occupied is None:
+            occupied = self.occupied
+        return (
+            (PAWN_ATTACKS[1 - color][sq] & pieces[PAWN])
+            | (KNIGHT_ATTACKS[sq] & pieces[KNIGHT])
+            | (KING_ATTACKS[sq] & pieces[KING])
+            | (rook_attacks(sq, occupied) & (pieces[ROOK] | pieces[QUEEN]))
+            | (bishop_attacks(sq, occupied) & (pieces[BISHOP] | pieces[QUEEN]))
+        )
+
     def get_path_between(self, start_pos, end_pos):
         """
         Retourne la liste des positions entre deux cases (exclusivement).
@@ -417,15 +651,8 @@ class Board:
         if not ((color == "white" and row == 0) or (color == "black" and row == 7)):
             return False
             
-        switcher = {
-            "Q": Queen,
-            "R": Rook,
-            "B": Bishop,
-            "N": Knight
-        }
-        
-        if piece_type in switcher:
-            self.board[row][col] = switcher[piece_type](color)
+        if piece_type in PROMOTION_PIECES:
+            self.set_piece(row, col, PROMOTION_PIECES[piece_type](color))
             self.promotion_pending = None
             return True
             
@@ -454,4 +681,59 @@ class Board:
     
     def to_list(self):
         """Convertit le plateau en une liste 2D de chaînes pour l'affichage."""
-        return [[str(piece) if piece != "" else "" for piece in row] for row in self.board]
\ No newline at end of file
+        return [[str(piece) if piece != "" else "" for piece in row] for row in self.board]
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Crée un plateau à partir d'une position en notation FEN."""
+        fields = fen.split()
+        placement, turn = fields[0], fields[1]
+        castling = fields[2] if len(fields) > 2 else "-"
+        en_passant = fields[3] if len(fields) > 3 else "-"
+
+        grid = []
+        for rank in placement.split("/"):
+            row = []
+            for char in rank:
+                if char.isdigit():
+                    row.extend([""] * int(char))
+                else:
+                    row.append(FEN_PIECES[char.lower()]("white" if char.isupper() else "black"))
+            grid.append(row)
+
+        board = cls()
+        board.castling_rights = 0
+        for flag, right in (("K", WHITE_KINGSIDE), ("Q", WHITE_QUEENSIDE), ("k", BLACK_KINGSIDE), ("q", BLACK_QUEENSIDE)):
+            if flag in castling:
+                board.castling_rights |= right
+        board.turn = "white" if turn == "w" else "black"
+        board.opponent = "black" if board.turn == "white" else "white"
+        if en_passant != "-":
+            board.ep_square = square(8 - int(en_passant[1]), ord(en_passant[0]) - ord('a'))
+        if len(fields) > 4:
+            board.halfmove_clock = int(fields[4])
+        if len(fields) > 5:
+            board.fullmove_number = board.move_count = int(fields[5])
+        board.set_board(grid)
+        return board
+
+    def to_fen(self):
+        """Retourne la position en notation FEN."""
+        ranks = []
+        for row in self.board:
+            rank, empty = "", 0
+            for piece in row:
+                if piece == "":
+                    empty += 1
+                    continue
+                if empty:
+                    rank, empty = rank + str(empty), 0
+                letter = "pnbrqk"[piece.piece_type]
+                rank += letter.upper() if piece.color == "white" else letter
+            ranks.append(rank + (str(empty) if empty else ""))
+        castling = "".join(flag for flag, right in (("K", WHITE_KINGSIDE), ("Q", WHITE_QUEENSIDE),
+                                                    ("k", BLACK_KINGSIDE), ("q", BLACK_QUEENSIDE))
+                           if self.castling_rights & right) or "-"
+        en_passant = SQUARE_NAMES[self.ep_square] if self.ep_square is not None else "-"
+        return (f"{'/'.join(ranks)} {'w' if self.turn == 'white' else 'b'} {castling} {en_passant} "
+                f"{self.halfmove_clock} {self.fullmove_number}")
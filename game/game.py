@@ -2,6 +2,7 @@
 
 from game.board import Board
 from game.ai import AI
+from game.move import SQUARE_NAMES
 import datetime
 import uuid
 
@@ -101,7 +102,7 @@ class Game:
                 return True, "La partie est déclarée nulle après 200 coups."
                 
             # Détecter les répétitions de positions
-            board_hash = self.board.hash_position()
+            board_hash = self.board.zobrist_key
             if board_hash in self.repeated_positions:
                 self.repeated_positions[board_hash] += 1
                 # Si une position se répète 3 fois, déclarer la partie nulle
@@ -131,8 +132,8 @@ class Game:
                 self.save_game_stats()
                 
             elif game_status == "Check":
-                message = f"Le roi de {self.opponent} est en échec !"
-                print(f"Échec détecté pour {self.opponent}")
+                message = f"Le roi de {self.turn} est en échec !"
+                print(f"Échec détecté pour {self.turn}")
             elif game_status == "Stalemate":
                 self.game_over = True
                 message = "Pat ! Match nul."
@@ -143,23 +144,16 @@ class Game:
                 
                 # Sauvegarder les statistiques de la partie
                 self.save_game_stats()
-            
-            # Vérifier directement si le roi adverse est en échec ou échec et mat
-            if self.board.is_king_in_check(self.opponent):
-                message = f"Le roi de {self.opponent} est en échec !"
-                print(f"Vérification supplémentaire: Le roi de {self.opponent} est en échec")
+            elif game_status == "Draw":
+                self.game_over = True
+                message = "Match nul (règle des 50 coups ou matériel insuffisant)."
+                print("Nulle détectée.")
                 
-                if self.board.is_checkmate(self.opponent):
-                    self.game_over = True
-                    self.winner = self.turn
-                    message = f"Échec et mat ! {self.winner.capitalize()} gagne."
-                    print(f"Vérification supplémentaire: Échec et mat! Gagnant: {self.winner}")
-                    
-                    # Apprentissage pour les IA
-                    self.learn_from_game()
-                    
-                    # Sauvegarder les statistiques de la partie
-                    self.save_game_stats()
+                # Apprentissage pour les IA en cas de match nul
+                self.learn_from_game()
+                
+                # Sauvegarder les statistiques de la partie
+                self.save_game_stats()
             
             # Si c'est maintenant le tour de l'IA, jouer automatiquement
             if not self.game_over:
@@ -286,8 +280,8 @@ class Game:
             print(f"Meilleur coup trouvé: {start_pos} → {end_pos}")
             
             # Convertir les positions en notation d'échecs
-            start_notation = chr(start_pos[1] + ord('a')) + str(8 - start_pos[0])
-            end_notation = chr(end_pos[1] + ord('a')) + str(8 - end_pos[0])
+            start_notation = SQUARE_NAMES[start_pos[0] * 8 + start_pos[1]]
+            end_notation = SQUARE_NAMES[end_pos[0] * 8 + end_pos[1]]
             print(f"Notation d'échecs: {start_notation} → {end_notation}")
             
             # Jouer le coup
@@ -1,6 +1,7 @@
 # game_manager.py
 import uuid
 from game.game import Game
+from game.pieces.piece import SaveUnpickler
 
 import os
 import json
@@ -61,7 +62,7 @@ class GameManager:
             if os.path.exists(save_path) and os.path.exists(player_save_path):
                 # Charger les parties
                 with open(save_path, 'rb') as f:
-                    self.games = pickle.load(f)
+                    self.games = SaveUnpickler(f).load()
                     
                 # Charger les associations joueurs-parties
                 with open(player_save_path, 'r') as f:
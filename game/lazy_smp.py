@@ -0,0 +1,233 @@
+# lazy_smp.py
+
+"""
+Recherche parallèle « Lazy SMP » sur plusieurs processus.
+
+Le processus principal et N processus auxiliaires cherchent la même position
+racine. Ils ne se parlent pas directement : ils partagent une table de
+transposition placée en mémoire partagée, et chacun profite des coupures et des
+meilleurs coups trouvés par les autres. Les auxiliaires commencent à des
+profondeurs décalées pour ne pas parcourir l'arbre dans le même ordre.
+
+Les processus auxiliaires sont gardés dans un pool pour toute la durée du
+programme ; chacun garde une IA et les tables partagées déjà ouvertes.
+
+Chaque auxiliaire publie aussi sa dernière profondeur terminée dans un petit
+tableau en mémoire partagée : un auxiliaire encore occupé à l'échéance ne fait
+pas perdre les profondeurs qu'il a déjà terminées.
+"""
+
+import multiprocessing
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from game.transposition import TranspositionTable
+
+# Nombre maximal de tables partagées gardées ouvertes dans un processus auxiliaire
+MAX_ATTACHED_TABLES = 8
+
+# Résultat publié par un auxiliaire ; `sequence` est impaire pendant une écriture
+RESULT_DTYPE = np.dtype([
+    ("sequence", np.uint32),
+    ("depth", np.int32),
+    ("search", np.float64),
+    ("score", np.float64),
+    ("move", np.uint32),
+], align=True)
+
+_pool = None
+_pool_size = 0
+_results = None
+
+# État propre à chaque processus auxiliaire
+_attached_tables = {}
+_attached_results = {}
+_worker_ais = {}
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """Table de transposition en mémoire partagée, ouverte par son nom dans les autres processus."""
+
+    def __init__(self, size_mb=16, name=None):
+        create = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=TranspositionTable.nbytes(size_mb))
+        super().__init__(size_mb, buffer=self.shm.buf)
+        if create:
+            self.entries.fill(0)
+        self.name = self.shm.name
+        # Le créateur libère le segment quand la table n'est plus utilisée
+        self._finalizer = weakref.finalize(self, _release, self.shm, create)
+
+    def close(self):
+        """Ferme la table (et supprime le segment si ce processus l'a créé)."""
+        self.keys = self.scores = self.moves = self.depths = self.bounds = self.generations = None
+        self.entries = None
+        self._finalizer()
+
+
+class HelperResults:
+    """Dernière profondeur terminée par chaque auxiliaire (une case par auxiliaire), en mémoire partagée."""
+
+    def __init__(self, slots, name=None):
+        create = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=slots * RESULT_DTYPE.itemsize)
+        self.entries = np.ndarray(slots, dtype=RESULT_DTYPE, buffer=self.shm.buf)
+        if create:
+            self.entries.fill(0)
+        self.slots = slots
+        self.name = self.shm.name
+        self._finalizer = weakref.finalize(self, _release, self.shm, create)
+
+    def publish(self, slot, search, depth, score, move):
+        """Écrit le résultat d'une profondeur terminée pour la recherche identifiée par `search`."""
+        entry = self.entries[slot:slot + 1]
+        entry["sequence"] += 1
+        entry["search"] = search
+        entry["depth"] = depth
+        entry["score"] = score
+        entry["move"] = move
+        entry["sequence"] += 1
+
+    def read(self, slot, search):
+        """Retourne (depth, score, move) publié pour la recherche `search`, ou None."""
+        entries = self.entries
+        for _ in range(100):
+            sequence = int(entries["sequence"][slot])
+            published = float(entries["search"][slot])
+            depth, score, move = int(entries["depth"][slot]), float(entries["score"][slot]), int(entries["move"][slot])
+            # Lecture valable seulement si aucune écriture n'a eu lieu pendant ce temps
+            if sequence % 2 == 0 and sequence == int(entries["sequence"][slot]):
+                if published != search or not move:
+                    return None
+                return depth, score, move
+        return None
+
+    def close(self):
+        self.entries = None
+        self._finalizer()
+
+
+def _release(shm, unlink):
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    try:
+        shm.close()
+    except BufferError:
+        # Des vues NumPy existent encore : la projection disparaîtra avec elles
+        pass
+
+
+def get_pool(workers):
+    """Retourne le pool de processus auxiliaires, créé (ou agrandi) à la demande."""
+    global _pool, _pool_size
+    if _pool is None or _pool_size < workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # "spawn" : pas de fork d'un processus qui a déjà des threads (serveur Flask)
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_size = workers
+    return _pool
+
+
+def get_results(slots):
+    """Retourne le tableau des résultats publiés par les auxiliaires, créé (ou agrandi) à la demande."""
+    global _results
+    if _results is None or _results.slots < slots:
+        if _results is not None:
+            _results.close()
+        _results = HelperResults(slots)
+    return _results
+
+
+def start_helpers(ai, board, max_depth, start_time, max_time):
+    """Lance les recherches auxiliaires sur la position et retourne leurs futures."""
+    table = ai.transposition_table
+    helpers = ai.max_workers - 1
+    pool = get_pool(helpers)
+    results = get_results(helpers + 1)
+    fen = board.to_fen()
+    return [
+        pool.submit(search_worker, table.name, table.size_mb, table.generation, fen, ai.color,
+                    ai.difficulty, worker_id, max_depth, start_time, max_time, results.name, results.slots)
+        for worker_id in range(1, helpers + 1)
+    ]
+
+
+def collect_helpers(futures, deadline, start_time=None):
+    """
+    Retourne les résultats (profondeur, score, coup, variante principale, nœuds) des
+    recherches auxiliaires lancées à `start_time`. Celles qui ne sont pas terminées à
+    `deadline` (heure absolue) rendent leur dernière profondeur publiée, sans variante
+    principale ni nombre de nœuds.
+    """
+    results = []
+    for worker_id, future in enumerate(futures, start=1):
+        try:
+            results.append(future.result(timeout=max(0.0, deadline - time.time())))
+        except Exception:
+            # Auxiliaire en retard ou en erreur : il s'arrêtera de lui-même à son échéance
+            future.cancel()
+            published = _results.read(worker_id, start_time) if _results is not None else None
+            if published is not None:
+                depth, score, move = published
+                results.append((depth, score, move, [], 0))
+    return results
+
+
+def _attach(name, size_mb):
+    table = _attached_tables.get(name)
+    if table is None:
+        if len(_attached_tables) >= MAX_ATTACHED_TABLES:
+            oldest = next(iter(_attached_tables))
+            _attached_tables.pop(oldest).close()
+        table = _attached_tables[name] = SharedTranspositionTable(size_mb, name=name)
+    return table
+
+
+def _attach_results(name, slots):
+    results = _attached_results.get(name)
+    if results is None:
+        for old in list(_attached_results):
+            _attached_results.pop(old).close()
+        results = _attached_results[name] = HelperResults(slots, name=name)
+    return results
+
+
+def search_worker(name, size_mb, generation, fen, color, difficulty, worker_id, max_depth, start_time, max_time,
+                  results_name=None, results_slots=0):
+    """
+    Recherche d'un processus auxiliaire : approfondissement itératif à partir d'une profondeur décalée.
+    Chaque profondeur terminée est publiée dans le tableau `results_name` s'il est donné.
+    """
+    from game.ai import AI
+    from game.board import Board
+
+    ai = _worker_ais.get((color, difficulty))
+    if ai is None:
+        ai = _worker_ais[(color, difficulty)] = AI(color, difficulty, tt_size_mb=0)
+    table = _attach(name, size_mb)
+    table.generation = generation
+    ai.transposition_table = table
+    ai.nodes_evaluated = 0
+    ai.clear_move_ordering()
+
+    results = _attach_results(results_name, results_slots) if results_name else None
+    board = Board.from_fen(fen)
+    best = (0, 0.0, 0)
+    for depth in range(1 + worker_id % 2, max_depth + 1):
+        score, move = ai.search_root(board, depth, start_time, max_time)
+        # Une profondeur interrompue par le temps n'est pas rendue
+        if ai.search_aborted or not move:
+            break
+        best = (depth, score, move)
+        if results is not None:
+            results.publish(worker_id, start_time, depth, score, move)
+    depth, score, move = best
+    return depth, score, move, ai.get_principal_variation(board, depth), ai.nodes_evaluated
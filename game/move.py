@@ -1,7 +1,136 @@
+# move.py
+
+"""
+Coups codés sur 16 bits : case de départ (bits 0-5), case d'arrivée (bits 6-11)
+et drapeaux (bits 12-15). Les cases sont les indices 0-63 de game.bitboard.
+
+Un coup est un simple entier, ce qui permet de stocker les listes de coups dans
+des array('H') et de conserver le meilleur coup dans la table de transposition
+sans créer d'objet. La classe Move n'est qu'une enveloppe légère pour l'interface.
+"""
+
+from functools import lru_cache
+
+# Drapeaux (4 bits de poids fort)
+QUIET = 0
+DOUBLE_PUSH = 1
+KING_CASTLE = 2
+QUEEN_CASTLE = 3
+CAPTURE = 4
+EN_PASSANT = 5
+PROMOTION = 8  # Bit de promotion, les deux bits de poids faible donnent la pièce
+
+# Pièce de promotion selon les deux bits de poids faible du drapeau
+PROMOTION_LETTERS = ("N", "B", "R", "Q")
+PROMOTION_FLAGS = {letter: PROMOTION | index for index, letter in enumerate(PROMOTION_LETTERS)}
+
+NULL_MOVE = 0  # a8a8 : jamais un coup légal
+
+SQUARE_NAMES = tuple(f"{'abcdefgh'[sq & 7]}{8 - (sq >> 3)}" for sq in range(64))
+
+
+def encode(from_sq, to_sq, flag=QUIET):
+    """Assemble un coup 16 bits."""
+    return from_sq | (to_sq << 6) | (flag << 12)
+
+
+def move_from(move):
+    return move & 63
+
+
+def move_to(move):
+    return (move >> 6) & 63
+
+
+def move_flag(move):
+    return move >> 12
+
+
+def is_capture(move):
+    """Vrai pour les prises, prise en passant et promotions avec prise comprises."""
+    return bool(move >> 12 & CAPTURE)
+
+
+def is_promotion(move):
+    return bool(move >> 12 & PROMOTION)
+
+
+def promotion_of(move):
+    """Retourne la lettre de la pièce de promotion ('Q', 'R', 'B', 'N'), ou None."""
+    flag = move >> 12
+    if flag & PROMOTION:
+        return PROMOTION_LETTERS[flag & 3]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def to_positions(move):
+    """Convertit un coup 16 bits en ((row, col), (row, col))."""
+    from_sq, to_sq = move & 63, (move >> 6) & 63
+    return (from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7)
+
+
+@lru_cache(maxsize=4096)
+def to_uci(move):
+    """Retourne la notation UCI du coup, par exemple 'e2e4' ou 'e7e8q'."""
+    notation = SQUARE_NAMES[move & 63] + SQUARE_NAMES[(move >> 6) & 63]
+    promotion = promotion_of(move)
+    if promotion:
+        notation += promotion.lower()
+    return notation
+
+
+@lru_cache(maxsize=4096)
+def to_algebraic(move):
+    """Retourne le coup sous la forme 'e2 → e4' utilisée dans le journal de l'IA."""
+    notation = f"{SQUARE_NAMES[move & 63]} → {SQUARE_NAMES[(move >> 6) & 63]}"
+    promotion = promotion_of(move)
+    if promotion:
+        notation += f"={promotion}"
+    return notation
+
+
 class Move:
-    def __init__(self, start_pos, end_pos):
-        self.start_pos = start_pos  # (ligne, colonne)
-        self.end_pos = end_pos      # (ligne, colonne)
+    """Enveloppe d'un coup 16 bits."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, start_pos, end_pos, promotion=None, flag=QUIET):
+        from_sq = start_pos[0] * 8 + start_pos[1]
+        to_sq = end_pos[0] * 8 + end_pos[1]
+        if promotion:
+            flag = (flag & CAPTURE) | PROMOTION_FLAGS[promotion]
+        self.value = encode(from_sq, to_sq, flag)
+
+    @classmethod
+    def from_int(cls, value):
+        move = cls.__new__(cls)
+        move.value = value
+        return move
+
+    @property
+    def start_pos(self):
+        return to_positions(self.value)[0]
+
+    @property
+    def end_pos(self):
+        return to_positions(self.value)[1]
+
+    @property
+    def promotion(self):
+        return promotion_of(self.value)
+
+    def __int__(self):
+        return self.value
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and other.value == self.value
+
+    def __hash__(self):
+        return self.value
+
+    def __repr__(self):
+        return f"Move({to_uci(self.value)})"
 
     def is_valid(self, board):
         """ Vérifie si un mouvement est valide (simplifié pour l'instant). """
@@ -14,8 +143,4 @@ class Move:
 
     def to_chess_notation(self):
         """ Convertit les positions en notation échiquéenne. """
-        def pos_to_notation(pos):
-            columns = 'abcdefgh'
-            return columns[pos[1]] + str(pos[0] + 1)
-
-        return pos_to_notation(self.start_pos) + pos_to_notation(self.end_pos)
+        return to_uci(self.value)
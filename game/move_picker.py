@@ -0,0 +1,151 @@
+# move_picker.py
+
+"""
+Sélection des coups par étapes pour la recherche.
+
+Les coups sont rendus dans l'ordre : coup de la table de transposition, bonnes
+prises (MVV-LVA, filtrées par SEE), coups killers, réponse au coup précédent,
+coups tranquilles triés par historique, puis prises perdantes. Chaque étape n'est
+générée et triée que si la précédente n'a pas provoqué de coupure : comme la
+plupart des coupures beta arrivent sur le premier ou le deuxième coup, les coups
+tranquilles ne sont souvent jamais générés.
+"""
+
+from game.bitboard import PAWN, QUEEN
+from game.move import CAPTURE, EN_PASSANT, PROMOTION
+from game.rules.move_generator import generate_moves, generate_captures
+from game.see import PIECE_VALUES, see
+
+QUEEN_PROMOTION = PROMOTION | 3
+
+
+def mvv_lva(board, move):
+    """Score d'une prise : la plus grosse victime d'abord, prise par le plus petit attaquant."""
+    grid = board.board
+    from_sq, to_sq = move & 63, (move >> 6) & 63
+    attacker = grid[from_sq >> 3][from_sq & 7].piece_type
+    if move >> 12 == EN_PASSANT:
+        victim = PAWN
+    else:
+        target = grid[to_sq >> 3][to_sq & 7]
+        victim = target.piece_type if target != "" else PAWN
+    return PIECE_VALUES[victim] * 10 - PIECE_VALUES[attacker] // 10
+
+
+def is_good_capture(board, move):
+    """Une prise est bonne si l'échange sur la case ne perd pas de matériel (SEE)."""
+    return see(board, move) >= 0
+
+
+def is_legal(board, move):
+    """Vrai si `move` (coup 16 bits venant d'une autre position) est légal ici ; seule la pièce jouée est générée."""
+    return move in generate_moves(board, None, move & 63)
+
+
+def _is_tactical(move):
+    flag = move >> 12
+    return bool(flag & CAPTURE) or flag == QUEEN_PROMOTION
+
+
+def _captures_by_value(board, tactical, bad_captures):
+    # Bonnes prises par MVV-LVA, les prises perdantes sont gardées pour la fin
+    tactical.sort(key=lambda move: mvv_lva(board, move) + (PIECE_VALUES[QUEEN] if move >> 12 & PROMOTION else 0),
+                  reverse=True)
+    for move in tactical:
+        if is_good_capture(board, move):
+            yield move
+        else:
+            bad_captures.append(move)
+
+
+def pick_moves(board, moves=None, tt_move=0, killers=(), history=None, countermove=0):
+    """
+    Générateur qui rend les coups légaux (coups 16 bits) par étapes. Sans `moves`,
+    chaque étape est générée à la demande : prises d'abord, coups tranquilles seulement
+    si aucun coup précédent n'a provoqué de coupure.
+    `history` est indexé par les 12 bits (départ, arrivée) du coup, pour le camp au trait.
+    `countermove` est la réponse qui a réfuté le coup précédent ailleurs dans l'arbre.
+    """
+    if moves is None:
+        yield from _generate_in_stages(board, tt_move, killers, history, countermove)
+        return
+
+    if tt_move and tt_move in moves:
+        yield tt_move
+
+    # Séparation en prises (et promotions en dame) et coups tranquilles, sans tri
+    tactical = []
+    quiets = []
+    underpromotions = []
+    for move in moves:
+        if move == tt_move:
+            continue
+        flag = move >> 12
+        if flag & PROMOTION and flag & 3 != 3:
+            underpromotions.append(move)
+        elif flag & CAPTURE or flag == QUEEN_PROMOTION:
+            tactical.append(move)
+        else:
+            quiets.append(move)
+
+    bad_captures = []
+    if tactical:
+        yield from _captures_by_value(board, tactical, bad_captures)
+
+    # Coups killers : coups tranquilles qui ont provoqué une coupure à la même profondeur
+    played_killers = []
+    for killer in killers:
+        if killer and killer != tt_move and killer in quiets:
+            played_killers.append(killer)
+            yield killer
+
+    # Coup qui a réfuté le même coup adverse ailleurs dans l'arbre
+    if (countermove and countermove != tt_move and countermove not in played_killers
+            and countermove in quiets):
+        played_killers.append(countermove)
+        yield countermove
+
+    # Coups tranquilles triés par score d'historique
+    if played_killers:
+        quiets = [move for move in quiets if move not in played_killers]
+    if history is not None and len(quiets) > 1:
+        quiets.sort(key=lambda move: history[move & 4095], reverse=True)
+    yield from quiets
+
+    yield from bad_captures
+    yield from underpromotions
+
+
+def _generate_in_stages(board, tt_move, killers, history, countermove):
+    # Coup de la table : vérifié en ne générant que les coups de la pièce concernée
+    if tt_move and is_legal(board, tt_move):
+        yield tt_move
+    else:
+        tt_move = 0
+
+    bad_captures = []
+    yield from _captures_by_value(board, [move for move in generate_captures(board) if move != tt_move],
+                                  bad_captures)
+
+    # Killers et réponse au coup précédent : coups tranquilles d'autres positions, à vérifier
+    played = [tt_move]
+    for move in (*killers, countermove):
+        if move and move not in played and not _is_tactical(move) and is_legal(board, move):
+            played.append(move)
+            yield move
+
+    # Aucune coupure jusqu'ici : génération complète des coups tranquilles
+    quiets = []
+    underpromotions = []
+    for move in generate_moves(board):
+        flag = move >> 12
+        if flag & PROMOTION and flag & 3 != 3:
+            underpromotions.append(move)
+        elif not _is_tactical(move) and move not in played:
+            quiets.append(move)
+    if history is not None and len(quiets) > 1:
+        quiets.sort(key=lambda move: history[move & 4095], reverse=True)
+    yield from quiets
+
+    yield from bad_captures
+    yield from underpromotions
@@ -0,0 +1,106 @@
+# perft.py
+
+"""
+Perft : compte les feuilles de l'arbre des coups légaux jusqu'à une profondeur donnée.
+
+Les totaux sont comparés à des valeurs de référence connues pour vérifier le
+générateur de coups (roque, prise en passant, promotions, clouages) et mesurer
+sa vitesse en nœuds par seconde.
+
+Utilisation : python -m game.perft [--depth N] [--fen FEN] [--divide]
+"""
+
+import argparse
+import time
+
+from game.board import Board
+from game.move import to_uci
+from game.rules.move_generator import generate_moves
+
+# (nom, FEN, nombre de feuilles attendu pour les profondeurs 1, 2, 3, ...)
+REFERENCE_POSITIONS = [
+    ("initial", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+     [20, 400, 8902, 197281]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862]),
+    ("position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238]),
+    ("position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467]),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379]),
+    ("position 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890]),
+]
+
+
+def perft(board, depth):
+    """Retourne le nombre de positions atteintes en `depth` demi-coups."""
+    moves = generate_moves(board)
+    # Au dernier niveau, on compte les coups sans les jouer
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth):
+    """Retourne le nombre de feuilles sous chaque coup de la position, indexé par sa notation."""
+    counts = {}
+    for move in generate_moves(board):
+        board.make_move(move)
+        counts[to_uci(move)] = perft(board, depth - 1)
+        board.unmake_move()
+    return counts
+
+
+def run(name, fen, depth, expected=None):
+    """Lance un perft chronométré, affiche le résultat et retourne True s'il est correct."""
+    board = Board.from_fen(fen)
+    start = time.perf_counter()
+    nodes = perft(board, depth)
+    elapsed = time.perf_counter() - start
+    nps = nodes / elapsed if elapsed > 0 else 0
+
+    status = ""
+    ok = True
+    if expected is not None:
+        ok = nodes == expected
+        status = "OK" if ok else f"ÉCHEC (attendu {expected})"
+    print(f"{name:<12} profondeur {depth} : {nodes:>9} nœuds en {elapsed:.2f} s ({nps:,.0f} nœuds/s) {status}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vérifie le générateur de coups par perft.")
+    parser.add_argument("--depth", type=int, default=3, help="profondeur maximale (3 par défaut)")
+    parser.add_argument("--fen", help="position à tester au lieu des positions de référence")
+    parser.add_argument("--divide", action="store_true", help="détaille le compte pour chaque coup")
+    args = parser.parse_args(argv)
+
+    if args.fen:
+        if args.divide:
+            board = Board.from_fen(args.fen)
+            counts = divide(board, args.depth)
+            for notation, nodes in sorted(counts.items()):
+                print(f"{notation}: {nodes}")
+            print(f"Total : {sum(counts.values())}")
+            return 0
+        run("fen", args.fen, args.depth)
+        return 0
+
+    failures = 0
+    for name, fen, counts in REFERENCE_POSITIONS:
+        depth = min(args.depth, len(counts))
+        if not run(name, fen, depth, counts[depth - 1]):
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
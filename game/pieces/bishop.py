@@ -1,31 +1,17 @@
 # bishop.py
 
 from game.pieces.piece import Piece
+from game.bitboard import BISHOP, COLOR_INDEX, square
+from game.rules.attack_tables import bishop_attacks, targets
 
 class Bishop(Piece):
-    def __init__(self, color):
-        super().__init__(color)
+    __slots__ = ()
+    piece_type = BISHOP
 
     def __str__(self):
         return "♗" if self.color == "white" else "♝"
 
     def get_valid_moves(self, row, col, board):
-        moves = []
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]  # Diagonales
-
-        for direction in directions:
-            r, c = row, col
-            while True:
-                r += direction[0]
-                c += direction[1]
-                if 0 <= r < 8 and 0 <= c < 8:
-                    if board.get_board()[r][c] == "":  # Case vide
-                        moves.append((r, c))
-                    elif board.get_board()[r][c].color != self.color:  # Pièce adverse
-                        moves.append((r, c))
-                        break
-                    else:
-                        break
-                else:
-                    break
-        return moves
+        # Rayons coupés au premier bloqueur, moins les cases occupées par nos pièces
+        own = board.occupancy[COLOR_INDEX[self.color]]
+        return targets(bishop_attacks(square(row, col), board.occupied) & ~own)
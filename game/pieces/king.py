@@ -1,35 +1,41 @@
 # king.py
 
 from game.pieces.piece import Piece
+from game.bitboard import KING, COLOR_INDEX, square
+from game.rules.attack_tables import KING_ATTACKS, targets
+from game.zobrist import WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+
+# Droits de roque (petit, grand) de chaque couleur
+CASTLING_RIGHTS = {
+    "white": (WHITE_KINGSIDE, WHITE_QUEENSIDE),
+    "black": (BLACK_KINGSIDE, BLACK_QUEENSIDE)
+}
 
 class King(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        self.has_moved = False  # Pour vérifier si le roi a déjà bougé (important pour le roque)
+    __slots__ = ()
+    piece_type = KING
 
     def __str__(self):
         return "♔" if self.color == "white" else "♚"
 
     def get_valid_moves(self, row, col, board):
         moves = []
-        directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-        
-        # Utiliser directement le plateau pour vérifier les mouvements possibles
-        for direction in directions:
-            r, c = row + direction[0], col + direction[1]
-            if 0 <= r < 8 and 0 <= c < 8:
-                # Vérifier si la case est vide ou contient une pièce adverse
-                target_piece = board.get_board()[r][c]
-                if target_piece == "" or (isinstance(target_piece, Piece) and target_piece.color != self.color):
-                    # Simuler le mouvement pour vérifier si le roi ne se met pas en échec
-                    simulate_board = board.copy()
-                    simulate_board.set_piece(row, col, "")  # Enlève le roi de sa position actuelle
-                    simulate_board.set_piece(r, c, self)    # Place le roi à la nouvelle position
-                    
-                    # Vérifier si le roi n'est pas en échec après ce mouvement
-                    if not simulate_board.is_king_in_check(self.color):
-                        moves.append((r, c))
-        
+        own = board.occupancy[COLOR_INDEX[self.color]]
+        
+        # Cases voisines depuis la table, vides ou occupées par une pièce adverse
+        for r, c in targets(KING_ATTACKS[square(row, col)] & ~own):
+            target_piece = board.get_board()[r][c]
+            # Simuler le mouvement sur place pour vérifier si le roi ne se met pas en échec
+            board.set_piece(row, col, "")  # Enlève le roi de sa position actuelle
+            board.set_piece(r, c, self)    # Place le roi à la nouvelle position
+            in_check = board.is_king_in_check(self.color)
+            board.set_piece(r, c, target_piece)
+            board.set_piece(row, col, self)
+            
+            # Vérifier si le roi n'est pas en échec après ce mouvement
+            if not in_check:
+                moves.append((r, c))
+
         # Vérifier les possibilités de roque
         castling_moves = self.get_castling_moves(row, col, board)
         moves.extend(castling_moves)
@@ -40,8 +46,9 @@ class King(Piece):
         """Vérifie si le roque est possible et retourne les mouvements valides."""
         castling_moves = []
         
-        # Si le roi a déjà bougé, le roque n'est pas possible
-        if self.has_moved:
+        # Les droits de roque sont tenus à jour par le plateau
+        kingside, queenside = CASTLING_RIGHTS[self.color]
+        if not board.castling_rights & (kingside | queenside):
             return []
         
         # Vérifier si le roi est en échec
@@ -56,28 +63,17 @@ class King(Piece):
             return []
         
         # Vérifier le petit roque (côté roi)
-        if self.can_castle_kingside(board, king_row):
+        if board.castling_rights & kingside and self.can_castle_kingside(board, king_row):
             castling_moves.append((king_row, 6))  # Position du roi après le petit roque
         
         # Vérifier le grand roque (côté reine)
-        if self.can_castle_queenside(board, king_row):
+        if board.castling_rights & queenside and self.can_castle_queenside(board, king_row):
             castling_moves.append((king_row, 2))  # Position du roi après le grand roque
         
         return castling_moves
     
     def can_castle_kingside(self, board, king_row):
-        """Vérifie si le petit roque est possible."""
-        # Vérifier si la tour est à sa place et n'a pas bougé
-        rook_col = 7
-        rook = board.get_board()[king_row][rook_col]
-        
-        if not rook or not isinstance(rook, Piece) or rook.__class__.__name__ != "Rook" or rook.color != self.color:
-            return False
-        
-        # Vérifier si la tour a déjà bougé
-        if hasattr(rook, "has_moved") and rook.has_moved:
-            return False
-        
+        """Vérifie si le petit roque est possible (le droit de roque est vérifié à part)."""
         # Vérifier si les cases entre le roi et la tour sont vides
         for col in range(5, 7):
             if board.get_board()[king_row][col] != "":
@@ -91,18 +87,7 @@ class King(Piece):
         return True
     
     def can_castle_queenside(self, board, king_row):
-        """Vérifie si le grand roque est possible."""
-        # Vérifier si la tour est à sa place et n'a pas bougé
-        rook_col = 0
-        rook = board.get_board()[king_row][rook_col]
-        
-        if not rook or not isinstance(rook, Piece) or rook.__class__.__name__ != "Rook" or rook.color != self.color:
-            return False
-        
-        # Vérifier si la tour a déjà bougé
-        if hasattr(rook, "has_moved") and rook.has_moved:
-            return False
-        
+        """Vérifie si le grand roque est possible (le droit de roque est vérifié à part)."""
         # Vérifier si les cases entre le roi et la tour sont vides
         for col in range(1, 4):
             if board.get_board()[king_row][col] != "":
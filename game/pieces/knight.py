@@ -1,25 +1,17 @@
 # knight.py
 
 from game.pieces.piece import Piece
+from game.bitboard import KNIGHT, COLOR_INDEX, square
+from game.rules.attack_tables import KNIGHT_ATTACKS, targets
 
 class Knight(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        
+    __slots__ = ()
+    piece_type = KNIGHT
+
     def __str__(self):
         return "♘" if self.color == "white" else "♞"
 
     def get_valid_moves(self, row, col, board):
-        moves = []
-        directions = [
-            (-2, -1), (-2, 1), (2, -1), (2, 1),
-            (-1, -2), (-1, 2), (1, -2), (1, 2)
-        ]
-
-        for direction in directions:
-            r, c = row + direction[0], col + direction[1]
-            if 0 <= r < 8 and 0 <= c < 8:
-                if board.get_board()[r][c] == "" or board.get_board()[r][c].color != self.color:  # Case vide ou pièce adverse
-                    moves.append((r, c))
-
-        return moves
+        # Cases attaquées depuis la table, moins celles occupées par nos pièces
+        own = board.occupancy[COLOR_INDEX[self.color]]
+        return targets(KNIGHT_ATTACKS[square(row, col)] & ~own)
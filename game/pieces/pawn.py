@@ -5,10 +5,12 @@ from game.pieces.knight import Knight
 from game.pieces.bishop import Bishop
 from game.pieces.queen import Queen
 from game.pieces.piece import Piece
+from game.bitboard import PAWN, COLOR_INDEX, square
+from game.rules.attack_tables import PAWN_ATTACKS, targets
 
 class Pawn(Piece):
-    def __init__(self, color):
-        super().__init__(color)
+    __slots__ = ()
+    piece_type = PAWN
 
     def __str__(self):
         return "♙" if self.color == "white" else "♟"
@@ -34,30 +36,14 @@ class Pawn(Piece):
             if board.get_board()[row + direction][col] == "" and board.get_board()[row + 2 * direction][col] == "":
                 moves.append((row + 2 * direction, col))
 
-        # Captures en diagonale
-        for diag in [-1, 1]:
-            new_col = col + diag
-            if 0 <= row + direction < 8 and 0 <= new_col < 8:
-                target_piece = board.get_board()[row + direction][new_col]
-                if target_piece and target_piece.color != self.color:  # Capture d'une pièce adverse
-                    moves.append((row + direction, new_col))
-
-        # Prise en passant
-        if hasattr(board, "history") and board.history:
-            if hasattr(board.history, "length") and board.history.length() <= 2:
-                return moves
-            if hasattr(board.history, "get_last_move"):
-                last_move = board.history.get_last_move()
-                if not isinstance(last_move.get("Piece"), Pawn):
-                    return moves
-                start_row, start_col = last_move["start"]
-                end_row, end_col = last_move["end"]
-                last_piece = board.get_board()[end_row][end_col]
-                if isinstance(last_piece, Pawn) and last_piece.color != self.color:
-                    if (self.color == "black" and end_row == 4) or (self.color == "white" and end_row == 3):
-                        if abs(end_col - col) == 1:
-                            moves.append((row + direction, end_col))
-                            print(f"Prise en passant possible à ({row + direction}, {end_col})")
+        # Captures en diagonale depuis la table d'attaques, y compris la prise en passant
+        # sur la case sautée par la dernière double poussée adverse
+        us = COLOR_INDEX[self.color]
+        capturable = board.occupancy[1 - us]
+        ep_square = getattr(board, "ep_square", None)
+        if ep_square is not None and ep_square >> 3 == (5 if self.color == "black" else 2):
+            capturable |= 1 << ep_square
+        moves.extend(targets(PAWN_ATTACKS[us][square(row, col)] & capturable))
 
         return moves
     
@@ -1,15 +1,48 @@
 # piece.py
 
+import pickle
+
+
 class Piece:
-    def __init__(self, color):
-        self.color = color  # "white" ou "black"
+    """
+    Pièce immuable : une seule instance par (type, couleur), partagée par tous les plateaux.
+    L'état qui change pendant la partie (droits de roque...) est porté par le plateau.
+    """
+
+    __slots__ = ("color",)
+    _instances = {}
+
+    def __new__(cls, color):
+        instance = Piece._instances.get((cls, color))
+        if instance is None:
+            instance = super().__new__(cls)
+            object.__setattr__(instance, "color", color)  # "white" ou "black"
+            Piece._instances[(cls, color)] = instance
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} est immuable")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # Le dépicklage repasse par __new__ et retrouve l'instance partagée
+        return (self.__class__, (self.color,))
+
+    def shared(self):
+        """Retourne l'instance partagée de même type et de même couleur."""
+        return self.__class__(self.color)
 
     def __str__(self):
         """
         Méthode spéciale pour afficher la pièce.
         """
         raise NotImplementedError("Cette méthode doit être implémentée dans chaque pièce spécifique.")
-    
+
     def get_color(self):
         """
         Renvoie la couleur de la pièce.
@@ -21,3 +54,40 @@ class Piece:
         Méthode à implémenter dans chaque sous-classe pour obtenir les coups possibles d'une pièce spécifique.
         """
         raise NotImplementedError("Cette méthode doit être implémentée dans chaque pièce spécifique.")
+
+
+_LEGACY_CLASSES = {}
+
+
+def _legacy_class(piece_class):
+    """
+    Classe de dépicklage des pièces mutables des anciennes sauvegardes, picklées sans couleur.
+    L'instance reçoit sa couleur par __setstate__ ; shared() retourne ensuite l'instance partagée.
+    """
+    legacy = _LEGACY_CLASSES.get(piece_class)
+    if legacy is None:
+        def __new__(cls, color=None):
+            if color is None:
+                return object.__new__(cls)
+            return piece_class(color)
+
+        def __setstate__(self, state):
+            object.__setattr__(self, "color", state["color"])
+
+        def __reduce__(self):
+            return (piece_class, (self.color,))
+
+        legacy = type(piece_class.__name__, (piece_class,), {
+            "__slots__": (), "__new__": __new__, "__setstate__": __setstate__, "__reduce__": __reduce__})
+        _LEGACY_CLASSES[piece_class] = legacy
+    return legacy
+
+
+class SaveUnpickler(pickle.Unpickler):
+    """Dépickle une sauvegarde, y compris les pièces mutables d'avant le partage des instances."""
+
+    def find_class(self, module, name):
+        cls = super().find_class(module, name)
+        if isinstance(cls, type) and issubclass(cls, Piece):
+            return _legacy_class(cls)
+        return cls
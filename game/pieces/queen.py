@@ -1,18 +1,17 @@
 # queen.py
 
 from game.pieces.piece import Piece
-from game.pieces.rook import Rook
-from game.pieces.bishop import Bishop
+from game.bitboard import QUEEN, COLOR_INDEX, square
+from game.rules.attack_tables import queen_attacks, targets
 
 class Queen(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        self.rook = Rook(color)
-        self.bishop = Bishop(color)
+    __slots__ = ()
+    piece_type = QUEEN
 
     def __str__(self):
         return "♕" if self.color == "white" else "♛"
 
     def get_valid_moves(self, row, col, board):
-        # La dame combine les mouvements de la tour et du fou
-        return self.rook.get_valid_moves(row, col, board) + self.bishop.get_valid_moves(row, col, board)
+        # La dame combine les rayons de la tour et du fou
+        own = board.occupancy[COLOR_INDEX[self.color]]
+        return targets(queen_attacks(square(row, col), board.occupied) & ~own)
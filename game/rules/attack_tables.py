@@ -0,0 +1,105 @@
+# attack_tables.py
+
+"""
+Tables d'attaques précalculées une seule fois à l'import.
+
+Pour chaque case (0-63, voir game.bitboard), on stocke le bitboard des cases
+attaquées par un cavalier, un roi ou un pion de chaque couleur placé sur cette case.
+
+Les pièces glissantes utilisent des rayons précalculés par direction : le rayon
+est coupé au premier bloqueur en retirant le rayon qui part de ce bloqueur.
+"""
+
+from game.bitboard import (
+    WHITE, BLACK, knight_attacks, king_attacks, pawn_attacks,
+    north, south, east, west, north_east, north_west, south_east, south_west,
+)
+
+KNIGHT_ATTACKS = tuple(knight_attacks(1 << sq) for sq in range(64))
+KING_ATTACKS = tuple(king_attacks(1 << sq) for sq in range(64))
+PAWN_ATTACKS = (
+    tuple(pawn_attacks(1 << sq, WHITE) for sq in range(64)),
+    tuple(pawn_attacks(1 << sq, BLACK) for sq in range(64)),
+)
+
+
+def _ray(sq, shift):
+    ray = 0
+    bb = shift(1 << sq)
+    while bb:
+        ray |= bb
+        bb = shift(bb)
+    return ray
+
+
+def _rays(shift):
+    return tuple(_ray(sq, shift) for sq in range(64))
+
+
+# Rayons par direction. Les directions "positives" vont vers les indices croissants :
+# leur premier bloqueur est le bit de poids faible, celui de poids fort sinon.
+ROOK_RAYS = ((_rays(south), True), (_rays(east), True), (_rays(north), False), (_rays(west), False))
+BISHOP_RAYS = ((_rays(south_east), True), (_rays(south_west), True),
+               (_rays(north_east), False), (_rays(north_west), False))
+
+
+def _slider_attacks(sq, occupied, directions):
+    attacks = 0
+    for rays, positive in directions:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            if positive:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= rays[blocker]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sq, occupied):
+    """Cases attaquées par une tour en sq selon l'occupation (bloqueurs inclus)."""
+    return _slider_attacks(sq, occupied, ROOK_RAYS)
+
+
+def bishop_attacks(sq, occupied):
+    """Cases attaquées par un fou en sq selon l'occupation (bloqueurs inclus)."""
+    return _slider_attacks(sq, occupied, BISHOP_RAYS)
+
+
+def queen_attacks(sq, occupied):
+    """Cases attaquées par une dame en sq selon l'occupation (bloqueurs inclus)."""
+    return _slider_attacks(sq, occupied, ROOK_RAYS) | _slider_attacks(sq, occupied, BISHOP_RAYS)
+
+
+def _between_table():
+    table = [[0] * 64 for _ in range(64)]
+    for rays, _ in ROOK_RAYS + BISHOP_RAYS:
+        for a in range(64):
+            ray = rays[a]
+            bb = ray
+            while bb:
+                low = bb & -bb
+                b = low.bit_length() - 1
+                table[a][b] = ray & ~rays[b] & ~low
+                bb ^= low
+    return tuple(tuple(row) for row in table)
+
+
+# Cases strictement comprises entre deux cases alignées (0 si elles ne le sont pas)
+BETWEEN = _between_table()
+
+
+# Position (row, col) de chaque case, pour reconvertir les bitboards en coups
+SQUARE_POSITIONS = tuple((sq >> 3, sq & 7) for sq in range(64))
+
+
+def targets(bb):
+    """Retourne la liste des positions (row, col) présentes dans un bitboard."""
+    positions = []
+    while bb:
+        low = bb & -bb
+        positions.append(SQUARE_POSITIONS[low.bit_length() - 1])
+        bb ^= low
+    return positions
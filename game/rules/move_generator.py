@@ -0,0 +1,309 @@
+# move_generator.py
+
+"""
+Générateur de coups légaux.
+
+Les pièces qui donnent échec et les pièces clouées sont calculées une seule fois
+par position. Chaque coup est ensuite filtré par des masques de bits (cases qui
+parent l'échec, rayon du clouage) au lieu d'être joué pour vérifier que le roi
+n'est pas laissé en échec.
+
+Les coups sont produits au format 16 bits de game.move dans un array('H').
+"""
+
+from array import array
+
+from game.bitboard import (
+    WHITE, COLOR_INDEX, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, FULL, lsb, iter_squares,
+)
+from game.rules.attack_tables import (
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN,
+    rook_attacks, bishop_attacks, queen_attacks,
+)
+from game.zobrist import WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+from game.move import (
+    QUIET, DOUBLE_PUSH, KING_CASTLE, QUEEN_CASTLE, CAPTURE, EN_PASSANT, PROMOTION,
+    promotion_of, to_positions,
+)
+
+# Roque : (droit, case du roi, case d'arrivée du roi, cases à vider, cases à ne pas traverser en échec, drapeau)
+CASTLING = (
+    (
+        (WHITE_KINGSIDE, 60, 62, (1 << 61) | (1 << 62), (61, 62), KING_CASTLE),
+        (WHITE_QUEENSIDE, 60, 58, (1 << 57) | (1 << 58) | (1 << 59), (59, 58), QUEEN_CASTLE),
+    ),
+    (
+        (BLACK_KINGSIDE, 4, 6, (1 << 5) | (1 << 6), (5, 6), KING_CASTLE),
+        (BLACK_QUEENSIDE, 4, 2, (1 << 1) | (1 << 2) | (1 << 3), (3, 2), QUEEN_CASTLE),
+    ),
+)
+
+# Drapeaux des promotions, dame en premier pour que l'ordre de génération la favorise
+PROMOTION_FLAGS = tuple(PROMOTION | piece for piece in (3, 2, 1, 0))
+
+# Rangée de promotion de chaque couleur (8e rangée pour les blancs, 1re pour les noirs)
+PROMOTION_RANKS = (0xFF, 0xFF << 56)
+
+
+def checkers_and_pins(board, us, king_sq):
+    """
+    Retourne (checkers, pinned) pour le roi de la couleur `us` en king_sq :
+    le bitboard des pièces adverses qui donnent échec, et un dictionnaire
+    case clouée -> masque des cases où cette pièce peut encore aller.
+    """
+    them = 1 - us
+    enemy = board.bitboards[them]
+    checkers = board.attackers_to(king_sq, them)
+
+    # Pièces glissantes adverses alignées sur le roi en ne tenant compte que des pièces adverses
+    snipers = (
+        (rook_attacks(king_sq, board.occupancy[them]) & (enemy[ROOK] | enemy[QUEEN]))
+        | (bishop_attacks(king_sq, board.occupancy[them]) & (enemy[BISHOP] | enemy[QUEEN]))
+    )
+    pinned = {}
+    for sniper in iter_squares(snipers):
+        between = BETWEEN[king_sq][sniper] & board.occupied
+        # Une seule pièce entre le roi et le tireur, et c'est une des nôtres : elle est clouée
+        if between and not between & (between - 1) and between & board.occupancy[us]:
+            pinned[lsb(between)] = BETWEEN[king_sq][sniper] | (1 << sniper)
+    return checkers, pinned
+
+
+def generate_legal_moves(board, color=None, from_square=None, underpromotions=False):
+    """
+    Retourne la liste des coups légaux ((row, col), (row, col)) de la couleur donnée
+    (le trait par défaut). Si from_square (0-63) est donné, seuls les coups de la pièce
+    sur cette case sont produits. Les promotions sont produites une seule fois
+    (promotion en dame par défaut), ou pour chaque pièce sous la forme
+    ((row, col), (row, col), 'Q'|'R'|'B'|'N') si underpromotions est vrai.
+    """
+    moves = []
+    for move in generate_moves(board, color, from_square):
+        promotion = promotion_of(move)
+        if promotion is None:
+            moves.append(to_positions(move))
+        elif underpromotions:
+            moves.append(to_positions(move) + (promotion,))
+        elif promotion == "Q":
+            moves.append(to_positions(move))
+    return moves
+
+
+def generate_moves(board, color=None, from_square=None):
+    """
+    Retourne les coups légaux de la couleur donnée (le trait par défaut) au format
+    16 bits de game.move, dans un array('H'). Chaque promotion est produite pour
+    les quatre pièces possibles.
+    """
+    return _generate(board, color, from_square, False)
+
+
+def generate_captures(board, color=None):
+    """
+    Retourne uniquement les coups tactiques légaux pour la recherche de quiescence :
+    prises (en passant comprise) et promotions en dame. Les cases d'arrivée sont
+    limitées aux pièces adverses avant toute énumération, sans produire les coups tranquilles.
+    """
+    return _generate(board, color, None, True)
+
+
+def generate_evasions(board, color=None):
+    """
+    Retourne les parades à l'échec du roi de la couleur donnée : déplacements du roi,
+    prise de la pièce qui donne échec ou interposition. À utiliser quand in_check()
+    est vrai ; un résultat vide signifie alors l'échec et mat.
+
+    Les coups sont cherchés à rebours depuis les cases utiles (pièce qui donne échec
+    et cases entre elle et le roi) au lieu de générer puis filtrer tous les coups.
+    """
+    us = COLOR_INDEX[color or board.turn]
+    them = 1 - us
+    pieces = board.bitboards[us]
+    if not pieces[KING]:
+        return _generate(board, color, None, False)
+    king_sq = lsb(pieces[KING])
+    checkers, pinned = checkers_and_pins(board, us, king_sq)
+    if not checkers:
+        return _generate(board, color, None, False)
+
+    enemy_occupancy = board.occupancy[them]
+    moves = array("H")
+    append = moves.append
+
+    # Déplacements du roi vers une case non attaquée une fois le roi retiré
+    without_king = board.occupied ^ (1 << king_sq)
+    for to in iter_squares(KING_ATTACKS[king_sq] & ~board.occupancy[us]):
+        if not board.attackers_to(to, them, without_king):
+            flag = CAPTURE if enemy_occupancy >> to & 1 else QUIET
+            append(king_sq | (to << 6) | (flag << 12))
+
+    # En double échec, seul le roi peut bouger
+    if checkers & (checkers - 1):
+        return moves
+
+    checker_sq = lsb(checkers)
+    forward = -8 if us == WHITE else 8
+    promotion_row = 0 if us == WHITE else 7
+    not_king = ~pieces[KING]
+
+    def add(from_sq, to, flag):
+        if from_sq in pinned and not pinned[from_sq] >> to & 1:
+            return
+        if pieces[PAWN] >> from_sq & 1 and to >> 3 == promotion_row:
+            for promotion in PROMOTION_FLAGS:
+                append(from_sq | (to << 6) | ((flag | promotion) << 12))
+        else:
+            append(from_sq | (to << 6) | (flag << 12))
+
+    # Prise de la pièce qui donne échec
+    for from_sq in iter_squares(board.attackers_to(checker_sq, us) & not_king):
+        add(from_sq, checker_sq, CAPTURE)
+
+    # Interposition : pièces qui atteignent une case entre le roi et la pièce qui donne échec
+    blocks = BETWEEN[king_sq][checker_sq]
+    sliders_and_knights = not_king & ~pieces[PAWN]
+    start_row = 6 if us == WHITE else 1
+    for to in iter_squares(blocks):
+        for from_sq in iter_squares(board.attackers_to(to, us) & sliders_and_knights):
+            add(from_sq, to, QUIET)
+        one = to - forward
+        if not 0 <= one < 64:
+            continue
+        if pieces[PAWN] >> one & 1:
+            add(one, to, QUIET)
+        elif (not board.occupied >> one & 1 and (one - forward) >> 3 == start_row
+              and pieces[PAWN] >> (one - forward) & 1):
+            add(one - forward, to, DOUBLE_PUSH)
+
+    # Prise en passant : retire le pion qui donne échec ou s'interpose sur la case de prise
+    ep_square = board.ep_square
+    if ep_square is not None and ep_square >> 3 == (2 if us == WHITE else 5):
+        if checkers >> (ep_square - forward) & 1 or blocks >> ep_square & 1:
+            for from_sq in iter_squares(PAWN_ATTACKS[them][ep_square] & pieces[PAWN]):
+                if _is_en_passant_legal(board, us, king_sq, from_sq, ep_square, forward):
+                    append(from_sq | (ep_square << 6) | (EN_PASSANT << 12))
+
+    return moves
+
+
+def in_check(board, color=None):
+    """Vrai si le roi de la couleur donnée (le trait par défaut) est attaqué."""
+    us = COLOR_INDEX[color or board.turn]
+    king = board.bitboards[us][KING]
+    return bool(king and board.attackers_to(lsb(king), 1 - us))
+
+
+def _generate(board, color, from_square, tactical):
+    us = COLOR_INDEX[color or board.turn]
+    them = 1 - us
+    pieces = board.bitboards[us]
+    own = board.occupancy[us]
+    enemy_occupancy = board.occupancy[them]
+    occupied = board.occupied
+    only = FULL if from_square is None else 1 << from_square
+    moves = array("H")
+    append = moves.append
+
+    if pieces[KING]:
+        king_sq = lsb(pieces[KING])
+        checkers, pinned = checkers_and_pins(board, us, king_sq)
+    else:
+        king_sq, checkers, pinned = None, 0, {}
+
+    def add(from_sq, destinations):
+        # Les prises et les coups tranquilles ne diffèrent que par le drapeau
+        captures = destinations & enemy_occupancy
+        destinations ^= captures
+        while captures:
+            low = captures & -captures
+            append(from_sq | ((low.bit_length() - 1) << 6) | (CAPTURE << 12))
+            captures ^= low
+        while destinations:
+            low = destinations & -destinations
+            append(from_sq | ((low.bit_length() - 1) << 6))
+            destinations ^= low
+
+    # Coups du roi : la case d'arrivée ne doit pas être attaquée une fois le roi retiré
+    if king_sq is not None and only >> king_sq & 1:
+        without_king = occupied ^ (1 << king_sq)
+        destinations = 0
+        king_targets = KING_ATTACKS[king_sq] & (enemy_occupancy if tactical else ~own)
+        for to in iter_squares(king_targets):
+            if not board.attackers_to(to, them, without_king):
+                destinations |= 1 << to
+        add(king_sq, destinations)
+        # Roque : pas en échec, cases vides et cases traversées non attaquées
+        if not checkers and not tactical:
+            rights = board.castling_rights
+            for right, from_sq, to_sq, empty, path, flag in CASTLING[us]:
+                if rights & right and king_sq == from_sq and not occupied & empty:
+                    if not any(board.attackers_to(sq, them) for sq in path):
+                        append(from_sq | (to_sq << 6) | (flag << 12))
+
+    # En double échec, seul le roi peut bouger
+    if checkers & (checkers - 1):
+        return moves
+
+    # En échec simple : capturer la pièce qui donne échec ou s'interposer
+    if checkers:
+        check_mask = checkers | BETWEEN[king_sq][lsb(checkers)]
+    else:
+        check_mask = FULL
+
+    target_mask = (enemy_occupancy if tactical else ~own) & check_mask
+    for piece_type, attacks in ((KNIGHT, None), (BISHOP, bishop_attacks), (ROOK, rook_attacks), (QUEEN, queen_attacks)):
+        for from_sq in iter_squares(pieces[piece_type] & only):
+            if attacks is None:
+                destinations = KNIGHT_ATTACKS[from_sq] & target_mask
+            else:
+                destinations = attacks(from_sq, occupied) & target_mask
+            if from_sq in pinned:
+                destinations &= pinned[from_sq]
+            add(from_sq, destinations)
+
+    forward = -8 if us == WHITE else 8
+    start_row = 6 if us == WHITE else 1
+    promotion_row = 0 if us == WHITE else 7
+    ep_square = board.ep_square
+    # La prise en passant n'est possible que pour le camp adverse de celui qui a poussé
+    if ep_square is not None and ep_square >> 3 != (2 if us == WHITE else 5):
+        ep_square = None
+
+    for from_sq in iter_squares(pieces[PAWN] & only):
+        allowed = pinned.get(from_sq, FULL) & check_mask
+        pushes = 0
+        one = from_sq + forward
+        # Un pion resté sur la dernière rangée (promotion en attente) ne peut plus avancer
+        if from_sq >> 3 != promotion_row and not occupied >> one & 1:
+            pushes |= 1 << one
+            if from_sq >> 3 == start_row and not occupied >> (one + forward) & 1:
+                pushes |= 1 << (one + forward)
+        pushes &= allowed
+        if tactical:
+            # Seules les poussées qui promeuvent sont des coups tactiques
+            pushes &= PROMOTION_RANKS[us]
+        captures = PAWN_ATTACKS[us][from_sq] & enemy_occupancy & allowed
+
+        if ep_square is not None and PAWN_ATTACKS[us][from_sq] >> ep_square & 1:
+            if king_sq is None or _is_en_passant_legal(board, us, king_sq, from_sq, ep_square, forward):
+                append(from_sq | (ep_square << 6) | (EN_PASSANT << 12))
+
+        for flag, destinations in ((CAPTURE, captures), (QUIET, pushes)):
+            for to in iter_squares(destinations):
+                if to >> 3 == promotion_row:
+                    for promotion in (PROMOTION_FLAGS[:1] if tactical else PROMOTION_FLAGS):
+                        append(from_sq | (to << 6) | ((flag | promotion) << 12))
+                elif flag == QUIET and abs(to - from_sq) == 16:
+                    append(from_sq | (to << 6) | (DOUBLE_PUSH << 12))
+                else:
+                    append(from_sq | (to << 6) | (flag << 12))
+
+    return moves
+
+
+def _is_en_passant_legal(board, us, king_sq, from_sq, ep_square, forward):
+    # La prise en passant retire deux pions d'une même rangée : on vérifie directement
+    # que le roi n'est pas attaqué dans la position obtenue (échecs à la découverte compris)
+    captured_sq = ep_square - forward
+    occupied = (board.occupied ^ (1 << from_sq) ^ (1 << captured_sq)) | (1 << ep_square)
+    return not board.attackers_to(king_sq, 1 - us, occupied) & ~(1 << captured_sq)
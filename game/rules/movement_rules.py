@@ -1,28 +1,12 @@
 # movement_rules.py
 
-from game.pieces.pawn import Pawn
-from game.pieces.rook import Rook
-from game.pieces.knight import Knight
-from game.pieces.bishop import Bishop
-from game.pieces.queen import Queen
-from game.pieces.king import King
+from game.bitboard import square
+from game.rules.move_generator import generate_legal_moves
 
 class MovementRules:
-    def __init__(self):
-        self.piece_rules = {
-            "pawn": Pawn,
-            "rook": Rook,
-            "knight": Knight,
-            "bishop": Bishop,
-            "queen": Queen,
-            "king": King,
-        }
-
     def get_valid_moves(self, piece, row, col, board):
         """
-        Renvoie les coups valides pour une pièce donnée selon sa classe.
+        Renvoie les cases d'arrivée légales de la pièce en (row, col),
+        à partir du générateur de coups légaux.
         """
-        piece_class = self.piece_rules.get(piece.__class__.__name__.lower())
-        if piece_class:
-            return piece_class(piece.color).get_valid_moves(row, col, board)
-        return []
+        return [end for _, end in generate_legal_moves(board, piece.color, from_square=square(row, col))]
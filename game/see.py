@@ -0,0 +1,82 @@
+# see.py
+
+"""
+Évaluation statique des échanges (SEE).
+
+Résout la suite de prises sur la case d'arrivée d'un coup, chaque camp reprenant
+avec sa pièce la moins chère, sans jouer les coups : les attaquants sont lus
+dans les bitboards et les pièces glissantes cachées derrière une pièce déjà
+échangée (rayons X) sont ajoutées au fur et à mesure que la case se dégage.
+Le résultat est le gain matériel attendu du coup, en centipions, pour le camp qui le joue.
+"""
+
+from game.bitboard import COLOR_INDEX, PAWN, BISHOP, ROOK, QUEEN, KING
+from game.rules.attack_tables import rook_attacks, bishop_attacks
+from game.move import CAPTURE, EN_PASSANT, PROMOTION, KING_CASTLE, QUEEN_CASTLE
+
+# Valeur des pièces par type (PAWN..KING)
+PIECE_VALUES = (100, 320, 330, 500, 900, 20000)
+
+PROMOTION_PIECES = (1, 2, 3, 4)  # Cavalier, fou, tour, dame selon les deux bits du drapeau
+
+
+def see(board, move):
+    """Retourne le gain matériel de `move` (coup 16 bits) une fois l'échange sur la case résolu."""
+    flag = move >> 12
+    if flag in (KING_CASTLE, QUEEN_CASTLE):
+        return 0
+
+    grid = board.board
+    from_sq, to_sq = move & 63, (move >> 6) & 63
+    mover = grid[from_sq >> 3][from_sq & 7]
+    side = COLOR_INDEX[mover.color]
+    bitboards = board.bitboards
+    occupied = board.occupied ^ (1 << from_sq)
+
+    if flag == EN_PASSANT:
+        gain = PIECE_VALUES[PAWN]
+        occupied ^= 1 << (to_sq + (8 if side == 0 else -8))
+    elif flag & CAPTURE:
+        gain = PIECE_VALUES[grid[to_sq >> 3][to_sq & 7].piece_type]
+    else:
+        gain = 0
+
+    on_square = mover.piece_type
+    if flag & PROMOTION:
+        on_square = PROMOTION_PIECES[flag & 3]
+        gain += PIECE_VALUES[on_square] - PIECE_VALUES[PAWN]
+
+    diagonal = [bitboards[c][BISHOP] | bitboards[c][QUEEN] for c in (0, 1)]
+    straight = [bitboards[c][ROOK] | bitboards[c][QUEEN] for c in (0, 1)]
+    attackers = (board.attackers_to(to_sq, 0, occupied) | board.attackers_to(to_sq, 1, occupied)) & occupied
+
+    gains = [gain]
+    side ^= 1
+    while True:
+        own = attackers & board.occupancy[side]
+        if not own:
+            break
+        # Attaquant le moins cher
+        for piece_type in range(PAWN, KING + 1):
+            candidates = own & bitboards[side][piece_type]
+            if candidates:
+                break
+        # Le roi ne peut reprendre que si la case n'est plus défendue
+        if piece_type == KING and attackers & board.occupancy[side ^ 1]:
+            break
+
+        gains.append(PIECE_VALUES[on_square] - gains[-1])
+        on_square = piece_type
+        occupied ^= candidates & -candidates
+        attackers &= occupied
+        # Rayons X : les pièces glissantes derrière l'attaquant retiré entrent dans l'échange
+        if piece_type in (PAWN, BISHOP, QUEEN):
+            attackers |= bishop_attacks(to_sq, occupied) & (diagonal[0] | diagonal[1]) & occupied
+        if piece_type in (ROOK, QUEEN):
+            attackers |= rook_attacks(to_sq, occupied) & (straight[0] | straight[1]) & occupied
+        side ^= 1
+
+    # Chaque camp peut s'arrêter de prendre si la suite lui est défavorable
+    for depth in range(len(gains) - 1, 0, -1):
+        gains[depth - 1] = -max(-gains[depth - 1], gains[depth])
+    return gains[0]
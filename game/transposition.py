@@ -0,0 +1,150 @@
+# transposition.py
+
+"""
+Table de transposition de taille fixe.
+
+Les entrées sont rangées dans des tableaux NumPy alloués une fois pour toutes,
+d'une taille donnée en mégaoctets. La clé de Zobrist choisit un seau de
+BUCKET_SIZE entrées ; chaque entrée garde les 32 bits de poids fort de la clé
+pour vérification, la profondeur, le type de borne, le score, le meilleur coup
+(16 bits) et la génération de la recherche qui l'a écrite.
+
+Dans un seau, une position déjà présente est mise à jour ; sinon on remplace
+l'entrée la moins utile : la moins profonde, les entrées des recherches
+précédentes étant sacrifiées en premier.
+
+Plusieurs processus peuvent écrire la même entrée en même temps (Lazy SMP) et
+les champs ne sont pas écrits d'un seul bloc. La clé enregistrée est donc
+combinée (ou exclusif) avec les autres champs : une entrée dont les champs
+viennent de deux écritures différentes ne correspond plus à sa clé et est ignorée.
+"""
+
+import numpy as np
+
+# Types de borne (0 : entrée vide)
+EXACT = 1
+LOWERBOUND = 2
+UPPERBOUND = 3
+
+BUCKET_SIZE = 4
+
+ENTRY_DTYPE = np.dtype([
+    ("key", np.uint32),
+    ("score", np.float32),
+    ("move", np.uint16),
+    ("depth", np.int8),
+    ("bound", np.uint8),
+    ("generation", np.uint8),
+], align=True)
+
+
+def _bucket_count(size_mb):
+    # La plus grande puissance de deux de seaux qui tient dans la taille demandée
+    buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_DTYPE.itemsize * BUCKET_SIZE))
+    return 1 << (buckets.bit_length() - 1)
+
+
+class TranspositionTable:
+    """Table de transposition indexée par clé de Zobrist, de taille fixe en mégaoctets."""
+
+    def __init__(self, size_mb=16, buffer=None):
+        buckets = _bucket_count(size_mb)
+        self.size_mb = size_mb
+        self.mask = buckets - 1
+        if buffer is None:
+            self.entries = np.zeros(buckets * BUCKET_SIZE, dtype=ENTRY_DTYPE)
+        else:
+            # Mémoire fournie par l'appelant (mémoire partagée entre processus par exemple)
+            self.entries = np.ndarray(buckets * BUCKET_SIZE, dtype=ENTRY_DTYPE, buffer=buffer)
+        # Vues par champ, créées une seule fois
+        self.keys = self.entries["key"]
+        self.scores = self.entries["score"]
+        self.score_bits = self.scores.view(np.uint32)
+        self.moves = self.entries["move"]
+        self.depths = self.entries["depth"]
+        self.bounds = self.entries["bound"]
+        self.generations = self.entries["generation"]
+        self.generation = 0
+
+    @staticmethod
+    def nbytes(size_mb):
+        """Taille en octets du tableau alloué pour `size_mb` mégaoctets."""
+        return _bucket_count(size_mb) * BUCKET_SIZE * ENTRY_DTYPE.itemsize
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """Vide la table."""
+        self.entries.fill(0)
+        self.generation = 0
+
+    def new_search(self):
+        """Passe à la génération suivante : les entrées existantes deviennent remplaçables en priorité."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def _fingerprint(self, slot):
+        # Score, coup, profondeur et borne de l'entrée réunis sur 32 bits
+        return (int(self.score_bits[slot]) ^ int(self.moves[slot])
+                ^ (int(self.depths[slot]) & 0xFF) << 16 ^ int(self.bounds[slot]) << 24)
+
+    def _check(self, slot):
+        # Clé de vérification de l'entrée, une fois retirée l'empreinte de ses autres champs
+        return int(self.keys[slot]) ^ self._fingerprint(slot)
+
+    def probe(self, key):
+        """Retourne (depth, score, bound, move) pour la position, ou None si elle est absente."""
+        check = key >> 32
+        index = (key & self.mask) * BUCKET_SIZE
+        bounds = self.bounds
+        for slot in range(index, index + BUCKET_SIZE):
+            if bounds[slot] and self._check(slot) == check:
+                return (int(self.depths[slot]), float(self.scores[slot]),
+                        int(bounds[slot]), int(self.moves[slot]))
+        return None
+
+    def store(self, key, depth, score, bound, move=0):
+        """Enregistre le résultat de la recherche d'une position."""
+        check = key >> 32
+        index = (key & self.mask) * BUCKET_SIZE
+        depths, generations, bounds = self.depths, self.generations, self.bounds
+        generation = self.generation
+
+        victim = index
+        worst = None
+        same = False
+        for slot in range(index, index + BUCKET_SIZE):
+            if not bounds[slot]:
+                victim = slot
+                break
+            if self._check(slot) == check:
+                victim, same = slot, True
+                break
+            # Valeur d'une entrée : sa profondeur, moins un malus pour chaque génération écoulée
+            value = int(depths[slot]) - 8 * ((generation - int(generations[slot])) & 0xFF)
+            if worst is None or value < worst:
+                victim, worst = slot, value
+
+        if same:
+            # Même position : une entrée nettement plus profonde de la recherche en cours
+            # n'est remplacée que par un score exact
+            if (bound != EXACT and generations[victim] == generation
+                    and depths[victim] > depth + 2):
+                return
+            # Un coup inconnu ne doit pas effacer le coup déjà trouvé
+            if not move:
+                move = int(self.moves[victim])
+
+        depths[victim] = max(-128, min(127, depth))
+        self.scores[victim] = score
+        self.moves[victim] = move
+        bounds[victim] = bound
+        generations[victim] = generation
+        # La clé est écrite en dernier, combinée avec les champs réellement enregistrés
+        self.keys[victim] = check ^ self._fingerprint(victim)
+
+    def hashfull(self):
+        """Taux de remplissage en pour mille, estimé sur les 1000 premières entrées de la génération courante."""
+        sample = self.entries[:1000]
+        used = (sample["bound"] != 0) & (sample["generation"] == self.generation)
+        return int(used.sum() * 1000 // len(sample))
@@ -0,0 +1,27 @@
+# zobrist.py
+
+"""
+Clés de Zobrist pour le hachage incrémental des positions.
+
+La clé d'une position est le XOR des clés de chaque (couleur, type de pièce, case),
+de la clé du trait aux noirs, de la clé des droits de roque et de la clé de la
+colonne de prise en passant. Les tables sont générées avec une graine fixe pour
+que les clés restent identiques d'une exécution à l'autre.
+"""
+
+import random
+
+_rng = random.Random(0x2C4E55)
+
+PIECE_KEYS = [[[_rng.getrandbits(64) for _ in range(64)] for _ in range(6)] for _ in range(2)]
+BLACK_TO_MOVE_KEY = _rng.getrandbits(64)
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(16)]
+EP_FILE_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+
+# Bits des droits de roque
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+
+CASTLING_KEYS[0] = 0
@@ -0,0 +1,388 @@
+# test_ai.py
+
+import itertools
+import pickle
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from game.ai import AI, MATE_SCORE, LMR_REDUCTIONS, LMR_MIN_DEPTH, DELTA_MARGIN, LAZY_EVAL_MARGIN
+from game.board import Board
+from game.lazy_smp import SharedTranspositionTable, collect_helpers, get_results, search_worker
+from game.move import encode, is_capture, to_positions, to_uci
+from game import move_picker
+from game.move_picker import pick_moves
+from game.perft import REFERENCE_POSITIONS
+from game.rules.move_generator import generate_moves
+from game.see import see
+from game.transposition import TranspositionTable, BUCKET_SIZE, EXACT, LOWERBOUND, UPPERBOUND
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+def test_move_picker_yields_every_move_once_in_stages():
+    board = Board.from_fen(KIWIPETE)
+    moves = board.status().moves
+    tt_move = moves[-1]
+    picked = list(pick_moves(board, moves, tt_move))
+    assert sorted(picked) == sorted(moves)
+    assert picked[0] == tt_move
+    # Les bonnes prises passent avant les coups tranquilles
+    first_quiet = next(i for i, move in enumerate(picked[1:], 1) if not is_capture(move))
+    assert all(is_capture(move) for move in picked[1:first_quiet])
+    assert to_uci(picked[1]) == "e2a6"  # Fou pris par un fou : plus grosse victime, plus petit attaquant
+
+
+def test_move_picker_is_lazy(monkeypatch):
+    board = Board.from_fen(KIWIPETE)
+    full_generations = []
+
+    def counting_generate_moves(board, color=None, from_square=None):
+        if from_square is None:
+            full_generations.append(board.zobrist_key)
+        return generate_moves(board, color, from_square)
+
+    monkeypatch.setattr(move_picker, "generate_moves", counting_generate_moves)
+    killer = next(m for m in generate_moves(board) if to_uci(m) == "a2a3")
+    picker = pick_moves(board, None, 0, [killer])
+    # Une coupure sur les prises ou le killer : les coups tranquilles ne sont jamais générés
+    first = next(picker)
+    assert is_capture(first) and to_uci(first) == "e2a6"
+    staged = [first] + list(itertools.takewhile(lambda move: move != killer, picker)) + [killer]
+    assert full_generations == []
+
+    rest = list(picker)
+    assert full_generations == [board.zobrist_key]
+    assert sorted(staged + rest) == sorted(generate_moves(board))
+    assert staged + rest == list(pick_moves(board, board.status().moves, 0, [killer]))
+
+
+def test_quiet_moves_follow_killers_countermove_and_history():
+    board = Board()
+    moves = board.status().moves
+    by_uci = {to_uci(move): move for move in moves}
+    ai = AI("white", "hard")
+    ai._update_move_ordering(0, by_uci["g1f3"], [by_uci["a2a3"]], 3, 0, None)
+    ai._update_move_ordering(0, by_uci["e2e4"], [], 2, 0, encode(12, 28))  # Réponse à e7e5
+    history = ai.history[0]
+    assert ai.killers[0] == [by_uci["e2e4"], by_uci["g1f3"]]
+    assert history[by_uci["g1f3"] & 4095] == 9 and history[by_uci["a2a3"] & 4095] == -9
+
+    picked = [to_uci(move) for move in pick_moves(board, moves, 0, [by_uci["b1c3"]], history, by_uci["d2d4"])]
+    assert picked[:4] == ["b1c3", "d2d4", "g1f3", "e2e4"]
+    assert picked[-1] == "a2a3"
+
+
+@pytest.mark.parametrize("fen, uci, expected", [
+    ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 100),
+    # Le cavalier prend un pion défendu, la tour en e2 et la dame derrière elle sont des rayons X
+    ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", -220),
+    ("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5", 100),
+    ("4k3/8/3p4/8/4N3/8/8/4K3 w - - 0 1", "e4c5", -320),
+])
+def test_see(fen, uci, expected):
+    board = Board.from_fen(fen)
+    move = next(m for m in generate_moves(board) if to_uci(m) == uci)
+    assert see(board, move) == expected
+
+
+def test_negamax_scores_from_side_to_move():
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    for color in ("white", "black"):
+        ai = AI(color, "hard")
+        # Mat en un (Ta8#) : le score ne dépend pas de la couleur de l'IA
+        assert ai.negamax(board, 2, -float("inf"), float("inf")) == MATE_SCORE - 1
+    assert board.undo_stack == []
+
+
+def test_transposition_table_is_fixed_size_and_ages_entries():
+    table = TranspositionTable(1)
+    assert table.entries.nbytes == TranspositionTable.nbytes(1) <= 1024 * 1024
+    key = 0x0123456789ABCDEF
+    table.store(key, 5, -42.5, EXACT, 1234)
+    assert table.probe(key) == (5, -42.5, EXACT, 1234)
+    assert table.probe(key ^ (1 << 48)) is None
+
+    # Seau plein d'entrées profondes : une nouvelle position remplace la plus ancienne
+    colliding = [key + (i << 40) for i in range(1, BUCKET_SIZE)]
+    for other in colliding:
+        table.store(other, 10, 0, LOWERBOUND)
+    table.new_search()
+    table.store(colliding[0], 10, 0, LOWERBOUND)
+    table.store(key + (9 << 40), 1, 0, UPPERBOUND)
+    assert table.probe(key + (9 << 40)) is not None
+    assert table.probe(colliding[0]) is not None
+    assert table.probe(key) is None
+
+    # Remplissage estimé sur les entrées de la génération courante
+    table.clear()
+    for bucket in range(250):
+        table.store(bucket, 1, 0, EXACT)
+    assert table.hashfull() == 250
+    table.new_search()
+    assert table.hashfull() == 0
+
+
+def test_transposition_table_survives_moves_until_new_game():
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    ai = AI("white", "hard", tt_size_mb=1)
+    assert ai.get_minimax_move(board, depth=2, max_time=5) == ((7, 0), (0, 0))
+    generation = ai.transposition_table.generation
+    ai.get_minimax_move(board, depth=2, max_time=5)
+    assert ai.transposition_table.generation == generation + 1
+    assert ai.transposition_table.probe(board.zobrist_key) is not None
+    ai.new_game()
+    assert ai.transposition_table.probe(board.zobrist_key) is None
+
+
+def test_aborted_search_stores_nothing():
+    board = Board.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    ai = AI("white", "hard", tt_size_mb=1)
+    # Temps déjà écoulé : la recherche s'arrête dès le premier nœud
+    ai.negamax(board, 4, -float("inf"), float("inf"), 0, time.time() - 10, 1)
+    assert ai.search_aborted
+    assert not ai.transposition_table.bounds.any()
+
+    # Interrompue en cours de route, la racine n'est pas enregistrée comme résultat exact
+    ai.search_root(board, 8, time.time(), 0.05)
+    assert ai.search_aborted
+    assert ai.transposition_table.probe(board.zobrist_key) is None
+    assert board.undo_stack == []
+
+    ai.search_root(board, 1)
+    assert not ai.search_aborted
+    assert ai.transposition_table.probe(board.zobrist_key)[:1] == (1,)
+
+
+def test_search_root_on_a_subset_of_moves_with_a_floor():
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    ai = AI("white", "hard", tt_size_mb=1)
+    mate = next(m for m in generate_moves(board) if to_uci(m) == "a1a8")
+    others = [m for m in generate_moves(board) if m != mate]
+    # Seul un score au-dessus du plancher est exact ; la racine n'est pas enregistrée
+    score, move = ai.search_root(board, 2, moves=others + [mate], alpha=100)
+    assert (move, score) == (mate, MATE_SCORE - 1)
+    assert ai.transposition_table.probe(board.zobrist_key) is None
+    score, move = ai.search_root(board, 2, moves=others, alpha=100)
+    assert score <= 100
+
+    score, move = ai.search_root(board, 2)
+    assert (move, score) == (mate, MATE_SCORE - 1)
+    assert ai.transposition_table.probe(board.zobrist_key)[3] == mate
+
+
+def test_transposition_table_ignores_torn_entries():
+    table = TranspositionTable(1)
+    key = 0x0123456789ABCDEF
+    table.store(key, 5, -42.5, EXACT, 1234)
+    slot = next(slot for slot in range(len(table)) if table.bounds[slot])
+    # Un autre processus n'a écrit que le score : l'entrée ne correspond plus à sa clé
+    table.scores[slot] = 300
+    assert table.probe(key) is None
+    table.store(key, 3, 10, LOWERBOUND, 99)
+    assert table.probe(key) == (3, 10, LOWERBOUND, 99)
+
+
+def test_interrupted_depth_does_not_count():
+    board = Board.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    ai = AI("white", "hard", tt_size_mb=1)
+    ai.max_workers = 1
+    move = ai.get_minimax_move(board, depth=6, max_time=0.5)
+    assert move in [to_positions(m) for m in board.status().moves]
+    entry = ai.transposition_table.probe(board.zobrist_key)
+    assert entry is None or entry[0] < 6
+    assert any(line.endswith("Profondeur maximale atteinte: " + str(entry[0] if entry else 0))
+               for line in ai.thought_log)
+
+
+def test_search_leaves_the_game_board_untouched():
+    board = Board.from_fen("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+    ai = AI("white", "hard", tt_size_mb=1)
+    ai.max_workers = 1
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("la recherche a joué un coup sur le plateau de la partie")
+
+    # Les autres threads du serveur lisent ce plateau pendant la réflexion
+    board.make_move = board.unmake_move = forbidden
+    assert ai.get_minimax_move(board, depth=3, max_time=2) is not None
+    assert board.undo_stack == []
+
+
+def test_shared_table_and_helper_search():
+    owner = SharedTranspositionTable(1)
+    try:
+        board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        # Recherche d'un auxiliaire, appelée ici dans le même processus
+        results = get_results(2)
+        start_time = time.time()
+        depth, score, move, pv, nodes = search_worker(owner.name, 1, 0, board.to_fen(), "white", "hard",
+                                                      1, 2, start_time, 30, results.name, results.slots)
+        assert results.read(1, start_time) == (depth, score, move)
+        assert (depth, to_uci(move), pv[0]) == (2, "a1a8", move)
+        assert score == MATE_SCORE - 1
+        # L'auxiliaire a écrit dans la mémoire partagée du créateur
+        assert owner.probe(board.zobrist_key)[3] == move
+    finally:
+        owner.close()
+
+
+def test_helpers_publish_finished_depths():
+    results = get_results(3)
+    start_time = time.time()
+    results.publish(1, start_time, 4, 12.5, 1234)
+    assert results.read(1, start_time) == (4, 12.5, 1234)
+    # Résultat d'une autre recherche, ou écriture en cours
+    assert results.read(1, start_time - 1) is None
+    results.entries["sequence"][1] += 1
+    assert results.read(1, start_time) is None
+    results.entries["sequence"][1] += 1
+
+    # Un auxiliaire encore occupé à l'échéance rend sa dernière profondeur publiée
+    running = Future()
+    assert collect_helpers([running], time.time(), start_time) == [(4, 12.5, 1234, [], 0)]
+
+
+def test_logged_principal_variation_starts_with_the_played_move():
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    ai = AI("white", "hard", tt_size_mb=1)
+    ai.max_workers = 1
+    assert ai.get_minimax_move(board, depth=3, max_time=5) == ((7, 0), (0, 0))
+    assert any(line.endswith("Variante principale: a1a8") for line in ai.thought_log)
+
+
+def test_late_move_reductions_grow_with_depth_and_move_index():
+    assert LMR_REDUCTIONS[LMR_MIN_DEPTH][:2] == [0, 0]
+    for depth in range(1, 64):
+        row = LMR_REDUCTIONS[depth]
+        assert row == sorted(row)
+        assert all(LMR_REDUCTIONS[depth - 1][index] <= row[index] for index in range(64))
+
+
+def test_frontier_pruning_uses_tunable_margins():
+    # Les blancs ont une dame de plus : une fenêtre nulle bien en dessous est coupée sans chercher
+    board = Board.from_fen("4k3/8/8/8/8/8/3Q4/4K3 w - - 0 1")
+    ai = AI("white", "hard")
+    assert ai.negamax(board, 2, -1, 0) >= 0
+    assert ai.nodes_evaluated == 1
+    ai.reverse_futility_margins = [0, 0, 0]
+    ai.razor_margins = [0, 0, 0]
+    assert ai.negamax(board, 1, 2000, 2001) <= 2000  # Razoring : directement en quiescence
+    assert ai.nodes_evaluated == 2
+
+
+def test_quiescence_search_resolves_captures_and_prunes_by_delta():
+    board = Board.from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+    ai = AI("white", "hard")
+    stand_pat = ai._evaluate_relative(board)
+    assert ai.quiescence_search(board, -float("inf"), float("inf")) > stand_pat + 800
+    # Même en prenant la dame, impossible d'atteindre alpha : aucune prise n'est jouée,
+    # et le bilan matériel suffit sans évaluation complète
+    ai.eval_cache.clear()
+    alpha = stand_pat + 2000
+    assert ai.quiescence_search(board, alpha, alpha + 1) == alpha
+    assert not ai.eval_cache
+
+
+def test_delta_pruning_counts_a_quiet_promotion_as_queen_minus_pawn(monkeypatch):
+    board = Board.from_fen("8/P6k/8/8/8/8/8/K7 w - - 0 1")
+    ai = AI("white", "hard")
+    played = []
+    make_move = board.make_move
+    monkeypatch.setattr(board, "make_move", lambda move: played.append(move) or make_move(move))
+    material = ai._evaluate_material(board)
+    # a8=D ne gagne que 800 : élaguée dès alpha = bilan + 800 + marge, sans prise fictive d'un pion
+    alpha = material + 800 + DELTA_MARGIN + 50
+    assert ai.quiescence_search(board, alpha, alpha + 1) == alpha
+    assert not played
+    alpha = material + 800 + DELTA_MARGIN - 50
+    ai.quiescence_search(board, alpha, alpha + 1)
+    assert played
+
+
+LAZY_EVAL_POSITIONS = [
+    "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "r2q1rk1/ppp2ppp/2np1n2/2b1p1B1/2B1P1b1/2NP1N2/PPP2PPP/R2Q1RK1 w - - 0 8",
+    "8/5pk1/6p1/8/3P4/6P1/5PK1/8 w - - 0 1",
+] + [fen for _, fen, _ in REFERENCE_POSITIONS]
+
+
+@pytest.mark.parametrize("color", ["white", "black"])
+def test_lazy_evaluation_margins_bound_the_full_evaluation(color):
+    ai = AI(color, "hard")
+    assert LAZY_EVAL_MARGIN == 502
+    for fen in LAZY_EVAL_POSITIONS:
+        board = Board.from_fen(fen)
+        if board.status().check:
+            continue
+        # Positions de recherche : toutes celles à un demi-coup de la position de référence
+        for move in [None] + list(board.status().moves):
+            if move is not None:
+                board.make_move(move)
+            if not board.status().check:
+                material = ai._evaluate_material(board)
+                below, above = ai._lazy_eval_margins(board)
+                assert material - below <= ai._evaluate_relative(board) <= material + above, (fen, move)
+            if move is not None:
+                board.unmake_move()
+
+
+def test_material_evaluation_matches_the_side_to_move():
+    ai = AI("black", "hard")
+    assert abs(ai._evaluate_material(Board())) < 50
+    board = Board.from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+    white = ai._evaluate_material(board)
+    assert abs(white + 400) < 50
+    assert ai._evaluate_material(Board.from_fen("4k3/8/8/3q4/8/8/8/3RK3 b - - 0 1")) == -white
+
+
+def test_evaluation_cache_respects_fifty_move_rule():
+    ai = AI("white", "hard")
+    board = Board.from_fen("4k3/8/8/8/8/8/8/3QK3 w - - 0 1")
+    assert ai._evaluate_relative(board) > 800
+    board.halfmove_clock = 100
+    assert ai._evaluate_relative(board) == 0
+
+
+def test_pickled_ai_leaves_search_tables_out():
+    ai = AI("white", "hard", tt_size_mb=1)
+    ai._evaluate_relative(Board())
+    ai.history[0][1] = 5
+    state = ai.__getstate__()
+    for name in ("transposition_table", "eval_cache", "board_state_cache", "killers", "history", "countermoves",
+                 "material_tables"):
+        assert name not in state
+    restored = pickle.loads(pickle.dumps(ai))
+    assert restored.eval_cache == {} and restored.history[0][1] == 0
+    assert restored._evaluate_material(Board()) == ai._evaluate_material(Board())
+
+
+def test_ai_saved_before_the_search_tables_still_searches():
+    ai = AI("white", "medium", tt_size_mb=1)
+    ai.opening_book = {}
+    # Attributs absents d'une IA sauvegardée avec la première version du jeu
+    for name in ("board_state_cache", "eval_cache", "killers", "history", "countermoves", "material_tables",
+                 "reverse_futility_margins", "razor_margins", "search_aborted", "tt_size_mb"):
+        del ai.__dict__[name]
+    restored = pickle.loads(pickle.dumps(ai))
+
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    assert restored.get_board_state(board) != "error"
+    assert restored.get_best_move(board, max_time=3) == ((7, 0), (0, 0))
+    assert not any("Erreur" in line for line in restored.thought_log)
+
+
+def test_recorded_moves_use_square_names_and_learning_keys(monkeypatch):
+    ai = AI("white", "easy")
+    monkeypatch.setattr(ai, "save_learning_data", lambda: None)
+    monkeypatch.setattr(ai, "save_opening_book", lambda: None)
+    ai.learning_data = {}
+    ai.record_move(Board(), ((6, 4), (4, 4)), 0)
+    assert ai.game_history[-1][1] == "e2e4"
+    assert ai.parse_move_notation("e2e4") == ((6, 4), (4, 4))
+
+    ai.learn_from_game("win")
+    # Clé lue par order_moves : ligne et colonne de départ puis d'arrivée
+    assert list(ai.learning_data) == ["6444"]
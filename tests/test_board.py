@@ -0,0 +1,146 @@
+# test_board.py
+
+import copyreg
+import io
+import pickle
+
+import pytest
+
+from game.board import Board, ALL_CASTLING
+from game.pieces.king import King
+from game.pieces.piece import Piece, SaveUnpickler
+from game.pieces.rook import Rook
+from game.perft import REFERENCE_POSITIONS, perft, divide
+from game.zobrist import BLACK_QUEENSIDE
+
+
+@pytest.mark.parametrize("name, fen, counts", REFERENCE_POSITIONS, ids=[p[0] for p in REFERENCE_POSITIONS])
+def test_perft_reference_positions(name, fen, counts):
+    board = Board.from_fen(fen)
+    key = board.zobrist_key
+    for depth, expected in enumerate(counts[:3], start=1):
+        assert perft(board, depth) == expected
+    # make_move / unmake_move doivent restaurer exactement la position
+    assert board.zobrist_key == key
+    assert board.undo_stack == []
+
+
+def test_divide_matches_perft():
+    board = Board()
+    counts = divide(board, 2)
+    assert len(counts) == 20
+    assert counts["e2e4"] == 20
+    assert sum(counts.values()) == 400
+
+
+def test_clone_position_is_independent():
+    board = Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    clone = board.clone_position()
+    clone.make_move(((7, 4), (7, 6)))
+    assert clone.zobrist_key == clone._compute_zobrist_key()
+    assert board.zobrist_key == board._compute_zobrist_key()
+    assert board.castling_rights == ALL_CASTLING
+    assert clone._history is None
+
+
+def test_move_counters_are_restored_by_unmake():
+    board = Board.from_fen("r3k2r/8/8/8/8/8/4P3/R3K2R b KQkq - 7 12")
+    state = (board.castling_rights, board.ep_square, board.halfmove_clock, board.fullmove_number, board.zobrist_key)
+    board.make_move(((0, 0), (0, 1)))
+    assert (board.halfmove_clock, board.fullmove_number) == (8, 13)
+    assert board.castling_rights == ALL_CASTLING & ~BLACK_QUEENSIDE
+    board.make_move(((6, 4), (4, 4)))
+    assert (board.halfmove_clock, board.ep_square) == (0, 44)
+    board.unmake_move()
+    board.unmake_move()
+    assert (board.castling_rights, board.ep_square, board.halfmove_clock,
+            board.fullmove_number, board.zobrist_key) == state
+
+
+@pytest.mark.parametrize("fen, expected", [
+    ("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3", "Checkmate"),
+    ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", "Stalemate"),
+    ("4k3/8/8/8/8/8/8/4KN2 w - - 0 1", "Draw"),
+    ("4k3/8/8/8/8/8/4P3/4K3 w - - 100 80", "Draw"),
+    ("4k3/8/8/8/8/8/4R3/4K3 b - - 0 1", "Check"),
+])
+def test_status(fen, expected):
+    board = Board.from_fen(fen)
+    assert board.check_game_status() == expected
+    status = board.status()
+    assert len(status.moves) == len(list(board.status().moves))
+
+
+def test_king_square_and_piece_list_follow_moves():
+    board = Board()
+    assert board.find_king("white") == (7, 4)
+    assert len(board.pieces("black")) == 16
+    board.make_move(((6, 4), (4, 4)))
+    board.make_move(((1, 3), (3, 3)))
+    board.make_move(((4, 4), (3, 3)))
+    assert len(board.pieces("black")) == 15
+    assert (3, 3, board.get_piece(3, 3)) in board.pieces("white")
+    board.make_move(((0, 4), (1, 3)))
+    assert board.find_king("black") == (1, 3)
+    board.unmake_move()
+    assert board.find_king("black") == (0, 4)
+
+
+@pytest.mark.parametrize("name, fen, counts", REFERENCE_POSITIONS, ids=[p[0] for p in REFERENCE_POSITIONS])
+def test_fen_round_trip(name, fen, counts):
+    assert Board.from_fen(fen).to_fen() == fen
+
+
+def test_null_move_flips_side_and_clears_en_passant():
+    board = Board.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    key = board.zobrist_key
+    board.make_null_move()
+    assert (board.turn, board.ep_square) == ("black", None)
+    assert board.zobrist_key == board._compute_zobrist_key()
+    board.unmake_null_move()
+    assert (board.turn, board.ep_square, board.zobrist_key) == ("white", 19, key)
+    assert board.undo_stack == []
+
+
+def test_unpickling_old_board_rebuilds_bitboards():
+    board = Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1")
+    # Plateau sauvegardé avant les bitboards : seuls les attributs d'origine existent
+    for name in ("bitboards", "occupancy", "occupied", "zobrist_key", "ep_square",
+                 "castling_rights", "halfmove_clock", "fullmove_number", "undo_stack"):
+        del board.__dict__[name]
+    board.__dict__["history"] = board.__dict__.pop("_history")
+
+    restored = pickle.loads(pickle.dumps(board))
+    assert restored.castling_rights == ALL_CASTLING
+    assert restored.zobrist_key == Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1").zobrist_key
+    assert len(restored.status().moves) == len(Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1").status().moves)
+
+
+class _LegacyPickler(pickle.Pickler):
+    """Pickle les pièces comme avant le partage des instances : objets mutables avec leur __dict__."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Piece):
+            return copyreg.__newobj__, (type(obj),), {"color": obj.color, "has_moved": False}
+        return NotImplemented
+
+
+def test_unpickling_legacy_pieces_uses_shared_instances():
+    board = Board()
+    buffer = io.BytesIO()
+    _LegacyPickler(buffer, protocol=4).dump(board)
+
+    with pytest.raises(TypeError):
+        pickle.loads(buffer.getvalue())
+
+    restored = SaveUnpickler(io.BytesIO(buffer.getvalue())).load()
+    assert restored.board[0][4] is King("black")
+    assert restored.board[7][0] is Rook("white")
+    assert restored.zobrist_key == board.zobrist_key
+    assert len(restored.status().moves) == 20
+    assert SaveUnpickler(io.BytesIO(pickle.dumps(board))).load().board[7][0] is Rook("white")
+
+
+def test_pieces_require_a_color():
+    with pytest.raises(TypeError):
+        King()
@@ -0,0 +1,104 @@
+# test_move.py
+
+import pytest
+
+from game.board import Board
+from game.move import (
+    Move, encode, move_from, move_to, is_capture, is_promotion, promotion_of, to_positions, to_uci,
+    CAPTURE, EN_PASSANT, PROMOTION,
+)
+from game.perft import REFERENCE_POSITIONS
+from game.rules.move_generator import generate_moves, generate_captures, generate_evasions, in_check
+
+
+def test_encoding_round_trip():
+    move = Move((6, 4), (4, 4))
+    assert move.start_pos == (6, 4)
+    assert move.end_pos == (4, 4)
+    assert move.to_chess_notation() == "e2e4"
+    assert Move.from_int(move.value) == move
+
+
+def test_promotion_and_flags():
+    move = encode(12, 3, CAPTURE | PROMOTION | 3)
+    assert move < 1 << 16
+    assert (move_from(move), move_to(move)) == (12, 3)
+    assert is_capture(move)
+    assert promotion_of(move) == "Q"
+    assert to_uci(move) == "e7d8q"
+    assert to_positions(move) == ((1, 4), (0, 3))
+
+
+def test_generated_moves_carry_flags():
+    board = Board.from_fen("4k3/1P6/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    moves = generate_moves(board)
+    assert moves.typecode == "H"
+    uci = {to_uci(m): m for m in moves}
+    assert uci["e5d6"] >> 12 == EN_PASSANT
+    assert {"b7b8q", "b7b8r", "b7b8b", "b7b8n"} <= set(uci)
+    board.make_move(uci["e5d6"])
+    assert board.get_piece(3, 3) == ""
+
+
+@pytest.mark.parametrize("name, fen, counts", REFERENCE_POSITIONS, ids=[p[0] for p in REFERENCE_POSITIONS])
+def test_capture_generator_matches_filtered_moves(name, fen, counts):
+    board = Board.from_fen(fen)
+    for move in list(generate_moves(board))[:8] + [None]:
+        if move is not None:
+            board.make_move(move)
+        expected = {m for m in generate_moves(board) if is_capture(m) and not is_promotion(m)
+                    or promotion_of(m) == "Q"}
+        assert set(generate_captures(board)) == expected
+        if move is not None:
+            board.unmake_move()
+
+
+def _leaves_king_safe(board, move):
+    color = board.turn
+    board.make_move(move)
+    safe = not in_check(board, color)
+    board.unmake_move()
+    return safe
+
+
+@pytest.mark.parametrize("fen", [
+    "4k3/8/8/8/8/8/4R3/4K3 b - - 0 1",
+    "4k3/8/8/8/1b6/8/2P5/2BQK3 w - - 0 1",
+    "4k3/8/8/2pP4/1K6/8/8/8 w - c6 0 1",
+    "4k3/8/8/8/8/5n2/8/3QK2r w - - 0 1",
+] + [p[1] for p in REFERENCE_POSITIONS[1:]], ids=lambda fen: fen.split()[0])
+def test_evasions_match_legal_moves_in_check(fen):
+    board = Board.from_fen(fen)
+    positions = 0
+    # Toutes les positions en échec à deux demi-coups de la position de départ
+    for first in list(generate_moves(board)) + [None]:
+        if first is not None:
+            board.make_move(first)
+        for second in [None] + list(generate_moves(board)):
+            if second is not None:
+                board.make_move(second)
+            if in_check(board):
+                positions += 1
+                evasions = list(generate_evasions(board))
+                expected = {move for move in generate_moves(board) if _leaves_king_safe(board, move)}
+                assert len(evasions) == len(set(evasions))
+                assert set(evasions) == expected
+            if second is not None:
+                board.unmake_move()
+        if first is not None:
+            board.unmake_move()
+    assert positions
+    assert not in_check(Board())
+
+
+@pytest.mark.parametrize("fen, start, end", [
+    ("4k3/P7/8/8/8/8/8/4K3 w - - 0 1", (1, 0), (0, 0)),
+    ("4k3/8/8/8/8/8/p7/4K3 b - - 0 1", (6, 0), (7, 0)),
+])
+def test_pawn_waiting_for_promotion_has_no_push(fen, start, end):
+    board = Board.from_fen(fen)
+    # Promotion demandée à part : le pion reste sur la dernière rangée
+    board.make_move((start, end), promotion=None)
+    board.make_null_move()
+    from_sq = end[0] * 8 + end[1]
+    assert not [move for move in generate_moves(board) if move & 63 == from_sq]